@@ -24,6 +24,34 @@ HW_CORE            = const(0)   # 1=hardware update runs on second core
 APPROX_SPIN_MS     = const(5)   # core==0, approx. duration of hardware update
 MIN_UPDATE_MS      = const(20)  # core==0, minimal time between hardware updates
 PULSE_STEPS        = const(25)  # Number of steps for Pixel/RGB pulsing
+SRV_CLUSTER        = const(0)   # 1=drive all servos via one PIO cluster
+SRV_CLUSTER_PIO    = const(0)   # PIO and state machine used for cluster
+SRV_CLUSTER_SM     = const(0)
+SRV_PIO_DMA        = const(0)   # 1=servo pulses from PIO+DMA engine (i.e.
+SRV_PIO_DMA_PIO    = const(1)   #   w/o CPU load), instead of the cluster
+SRV_RATE_MS        = const(15)  # servo update period [ms]; 0=auto-tuned
+SRV_WALL_CLOCK     = const(0)   # 1=servo moves timed by clock, not ticks
+SRV_HARD_IRQ       = const(0)   # 1=servo update as hard interrupt (moves
+                                #   are then always timed by clock)
+SRV_CORE1          = const(0)   # 1=servo update loop runs on second core
+                                #   (cannot be combined with `HW_CORE`=1)
+GAIT_LOOKAHEAD     = const(2)   # # of gait phases queued in advance
+GAIT_SPLINE        = const(0)   # 1=spline moves w/ velocity continuity
+                                #   (requires `GAIT_LOOKAHEAD` >= 2)
+GAIT_BLEND_MS      = const(0)   # overlap of consecutive gait phases (0=off)
+GAIT_COXA_TRJ      = const(0)   # trajectory type of coxa (swing) and femur
+GAIT_FEMUR_TRJ     = const(0)   #   (lift) joints, e.g. 1=linear, 2=sine
+                                #   (0=same for all joints)
+GAIT_FILE          = ""         # gait blob (e.g. "gaits/wave.gait", see
+                                #   `hexbotling_gait_packer.py`); ""=tripod
+GAIT_CPG           = const(0)   # 1=continuous gait from coupled oscillators
+CPG_STEP_MS        = const(40)  #   sampled every `CPG_STEP_MS` ms, with the
+CPG_FREQ_HZ        = 1.0        #   step frequency at velocity 1 and the
+CPG_DUTY           = 0.6        #   duty factor (fraction of a cycle on the
+                                #   ground) if not given in `set_params()`
+GAIT_IK            = const(0)   # 1=CPG gait w/ leg kinematics, i.e. stride
+IK_STRIDE_MM       = const(40)  #   and lift (foot height) in mm
+IK_LIFT_MM         = const(20)
 
 # Global parameters
 MAX_CURR_A         = 1.0         # maximum for normalizing sensed current
@@ -69,6 +97,13 @@ LEG_CR            = const(3)
 LEG_BL            = const(4)
 LEG_BR            = const(5)
 
+# Leg geometry (in mm; see `hxbl_leg_ik.py`): distance between coxa and femur
+# axes, and foot position relative to the femur axis (with the femur
+# horizontal), outwards and downwards
+LEG_COXA_MM       = const(20)
+LEG_FEMUR_MM      = const(35)
+LEG_TIBIA_MM      = const(60)
+
 # Servo order (IDs):
 # -----------
 #    --1--0  __  -2--3-
@@ -110,6 +145,11 @@ SRV_PIN           = bytearray([
     srv.SERVO_3,  srv.SERVO_4,  srv.SERVO_1, srv.SERVO_2
   ])
 
+# Additional calibration points (angle [deg], timing [us]) for servos that
+# are not linear enough, by servo index, e.g. {1: [(-30,1100), (0,1420),
+# (90,2300)]}; they replace the calibration from `SRV_RANGE_US`
+SRV_CALIB_POINTS  = {}
+
 SRV_COX           = bytearray([0,2,4,6,8,10])
 SRV_COX_DIR       = array.array("h", [ 1,-1, 1,-1, 1,-1])
 SRV_FEM           = bytearray([1,3,5,7,9,11])
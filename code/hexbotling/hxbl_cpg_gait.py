@@ -0,0 +1,249 @@
+# ----------------------------------------------------------------------------
+# hxbl_cpg_gait.py
+#
+# Continuous gait from a central pattern generator (CPG)
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# 2026-10-18, v1.1 - Optional leg inverse kinematics
+#
+# Each leg has a phase oscillator, which is coupled to a central rhythm
+# oscillator such that the legs converge to their phase offsets in the
+# pattern (tripod or wave), also after the pattern was changed. Within a
+# cycle, a leg is on the ground for the fraction "duty factor", moving
+# backwards, and swings forward lifted for the rest of the cycle. Instead
+# of a few keyframes per cycle, the gait is sampled every `step_ms` and the
+# servo manager follows these short keyframes without stopping (best with
+# spline trajectories).
+# Frequency, swing angle, duty factor, turn direction and reversing are
+# approached smoothly, hence they can be changed at any time.
+# With leg kinematics (`LegIK`), the stride and the lift are given in mm and
+# the feet move on straight lines with a constant velocity during stance.
+# ----------------------------------------------------------------------------
+import array
+import math
+import hxbl_config as cfg
+import hxbl_global as glb
+from hxbl_gait_base import GaitBase
+from robotling_lib.motors.servo_manager import ServoManager as sma
+
+# pylint: disable=bad-whitespace
+__version__  = "0.1.1.0"
+COUPLING     = 1.0     # coupling strength of the oscillators [Hz]
+SMOOTH_S     = 0.4     # time constant for changes of the inputs [s]
+STOP_MS      = 500     # duration of the move to neutral when stopping
+MIN_FREQ_HZ  = 0.1
+MAX_FREQ_HZ  = 3.0
+MIN_DUTY     = 0.4
+MAX_DUTY     = 0.9
+TWO_PI       = 2 *math.pi
+
+# Phase offsets of the legs (in cycles, in the order of the `LEG_xx`
+# indices) for the patterns (subtypes)
+_OFFSETS     = [
+    # Tripod: FL, CR, BL alternate with FR, CL, BR
+    (0.0, 0.5, 0.5, 0.0, 0.0, 0.5),
+    # Wave: one leg after the other (BL, CL, FL, BR, CR, FR)
+    (3/6, 0/6, 4/6, 1/6, 5/6, 2/6)
+  ]
+# pylint: enable=bad-whitespace
+
+# ----------------------------------------------------------------------------
+class CPGGait(GaitBase):
+  """Continuous gait from coupled phase oscillators"""
+
+  def __init__(self, step_ms=40, rate_ms=0):
+    # Initializing; if the servo manager's tick period `rate_ms` is given,
+    # the step is rounded to a multiple of it, as the moves last a whole
+    # number of ticks (otherwise, the legs would move faster or slower than
+    # the oscillators are integrated)
+    if rate_ms > 0:
+      step_ms = max(1, (step_ms +rate_ms //2) //rate_ms) *rate_ms
+    self._step_ms = step_ms
+    self._IK = None
+    super().__init__()
+    self._gaitType = "CPG"
+    self._subtypes = [0,1]
+    self._traject = sma.TRJ_LINEAR
+    glb.toLog("Gait set to `CPG`")
+
+  def reset(self):
+    """ Resets current gait
+    """
+    super().reset()
+    self._aCoxaSwing_deg = 23
+    self._aCoxaCenter_deg = 0
+    self._aLgLift_deg = 30
+    self._aLgDown_deg = 5
+    self._aMaxCoxa_deg = 40
+    self._tPhase_ms = self._step_ms
+    self._freqTarget = 1.0
+    self._dutyTarget = 0.6
+    self._turnTarget = 0.
+    self._sgnTarget = 1
+    self._stride_mm = 40
+    self._lift_mm = 20
+
+    # Current (smoothed) inputs; start with the legs down and centered
+    self._freq = self._freqTarget
+    self._duty = self._dutyTarget
+    self._turn = 0.
+    self._swing = 0.   # (in degrees or, with IK, in mm)
+    self._lift = 0.    # (above down angle, in degrees or, with IK, in mm)
+
+    # Central rhythm and leg oscillators, starting with the phase offsets of
+    # the pattern
+    self._theta = 0.
+    self._phi = array.array("f", _OFFSETS[self._subtype])
+
+  def _set_subtype(self, val):
+    """ Set gait pattern; the oscillators converge to it (no reset)
+    """
+    self._subtype = val if val in self._subtypes else 0
+
+  def _compile(self):
+    # (nothing to compile, the gait is computed for each step)
+    pass
+
+  def get_next_servo_pos(self, stop=False, turn_dir=0, rev=False):
+    """ Returns a list consisting of the duration of the move (in ms), an
+        array of angles for all servos, and the trajectory type, for the
+        next step (of `step_ms`) of the gait.
+        -1 <= `turn_dir` <= 1 gives the turn strength and direction.
+        `rev` == True walks backwards.
+        If `stop` is True, `turn_dir` is ignored.
+        As in `GaitBase`, the result is valid until the next call.
+    """
+    out = self._out
+    res = self._res
+    res[2] = self._traject
+    if stop:
+      # Stopped, move to neutral position; when starting again, swing and
+      # lift are slowly increased from zero
+      for iL in range(len(cfg.SRV_COX)):
+        out[cfg.SRV_COX[iL]] = self._aCoxaCenter_deg
+        out[cfg.SRV_FEM[iL]] = self._aLgDown_deg
+      self._isInSeq = False
+      self._swing = 0.
+      self._lift = 0.
+      res[0] = STOP_MS
+      return res
+
+    self._isInSeq = True
+    self._lastRev = rev
+    self._turnTarget = min(max(turn_dir, -1.), 1.)
+    sgn = 1 if self._seq == self.NORMAL else -1
+    self._sgnTarget = -sgn if rev else sgn
+    self._step(self._step_ms /1000)
+
+    # Swing angle of left and right legs; turning reduces the swing on one
+    # side and, beyond |`turn_dir`| = 0.5, inverts it (turn on the spot)
+    asw = self._swing
+    trn = self._turn
+    aL = asw *(1 -2*max(trn, 0))
+    aR = asw *(1 +2*min(trn, 0))
+    adn = self._aLgDown_deg
+    alf = self._lift
+    ik = self._IK
+    duty = self._duty
+    ac0 = self._aCoxaCenter_deg
+    phi = self._phi
+    for iL in range(len(phi)):
+      p = phi[iL]
+      if p < duty:
+        # Stance: leg on the ground, moving backwards
+        c = -1 +2 *p /duty
+        lft = 0.
+      else:
+        # Swing: leg lifted, moving forward
+        s = math.pi *(p -duty) /(1 -duty)
+        c = math.cos(s)
+        lft = math.sin(s)
+      a = aL if iL % 2 == 0 else aR
+      if ik:
+        # Foot position along the stride and height -> joint angles
+        ang = ik.angles(c *a, alf *lft)
+        acx = ang[0]
+        afm = ang[1]
+      else:
+        acx = int(c *a)
+        afm = int(adn +alf *lft)
+      out[cfg.SRV_COX[iL]] = ac0 +acx *cfg.SRV_COX_DIR[iL]
+      out[cfg.SRV_FEM[iL]] = afm
+    res[0] = self._step_ms
+    return res
+
+  def _step(self, dt_s):
+    # Let the inputs approach their targets and advance the oscillators by
+    # `dt_s` seconds
+    k = min(dt_s /SMOOTH_S, 1.)
+    self._freq += (self._freqTarget -self._freq) *k
+    self._duty += (self._dutyTarget -self._duty) *k
+    self._turn += (self._turnTarget -self._turn) *k
+    if self._IK:
+      asw = self._stride_mm /2
+      alf = self._lift_mm
+    else:
+      asw = self._aCoxaSwing_deg
+      alf = self._aLgLift_deg -self._aLgDown_deg
+    self._swing += (self._sgnTarget *asw -self._swing) *k
+    self._lift += (alf -self._lift) *k
+
+    # Each leg oscillator is pulled towards the phase of the central rhythm
+    # plus the leg's offset in the current pattern
+    th = (self._theta +self._freq *dt_s) % 1.
+    self._theta = th
+    phi = self._phi
+    psi = _OFFSETS[self._subtype]
+    for i in range(len(phi)):
+      d = self._freq +COUPLING *math.sin(TWO_PI *(th +psi[i] -phi[i]))
+      phi[i] = (phi[i] +d *dt_s) % 1.
+
+  # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  @property
+  def is_continuous(self):
+    return True
+
+  """ Stepping frequency (in Hz) """
+  @property
+  def frequency(self):
+    return self._freqTarget
+  @frequency.setter
+  def frequency(self, val):
+    self._freqTarget = min(max(val, MIN_FREQ_HZ), MAX_FREQ_HZ)
+
+  """ Leg kinematics (`LegIK`) or None """
+  @property
+  def kinematics(self):
+    return self._IK
+  @kinematics.setter
+  def kinematics(self, val):
+    self._IK = val
+    self._swing = 0.
+    self._lift = 0.
+
+  """ Stride length and lift height (in mm), used with leg kinematics """
+  @property
+  def stride_mm(self):
+    return self._stride_mm
+  @stride_mm.setter
+  def stride_mm(self, val):
+    self._stride_mm = max(val, 0)
+
+  @property
+  def lift_mm(self):
+    return self._lift_mm
+  @lift_mm.setter
+  def lift_mm(self, val):
+    self._lift_mm = max(val, 0)
+
+  """ Duty factor, fraction of the cycle a leg is on the ground """
+  @property
+  def duty_factor(self):
+    return self._dutyTarget
+  @duty_factor.setter
+  def duty_factor(self, val):
+    self._dutyTarget = min(max(val, MIN_DUTY), MAX_DUTY)
+
+# ----------------------------------------------------------------------------
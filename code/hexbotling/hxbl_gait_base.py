@@ -7,16 +7,35 @@
 # Copyright (c) 2022 Thomas Euler
 # 2022-05-04, v1.0
 # 2022-07-17, v1.1 - Take turn direction into account
+# 2026-10-17, v1.2 - Trajectory type as property
+# 2026-10-18, v1.3 - Rewind phases (for re-planning)
+# 2026-10-18, v1.4 - `_changed()` hook for gaits with precompiled tables
+# 2026-10-18, v1.5 - Table lookup of phases moved here from `TripodGait`;
+#                    data-driven gaits, loaded from a blob (`load()`)
+# 2026-10-18, v1.6 - `is_continuous` for gaits without phases
+# 2026-10-18, v1.7 - `leg_down_angle`
+# 2026-10-18, v1.8 - Switching subtypes while walking (`switch_subtype()`)
 # ----------------------------------------------------------------------------
+import array
+import micropython
 from micropython import const
+import hxbl_config as cfg
+import hxbl_global as glb
+import hxbl_gait_blob as blob
+from robotling_lib.motors.servo_manager import ServoManager as sma
 
 # pylint: disable=bad-whitespace
-__version__  = "0.1.1.0"
+__version__  = "0.1.8.0"
+
+# Coxa polarity of left and right legs for straight, right and left turn
+TURN         = ((1, 1), (-1, 1), (1, -1))
 # pylint: enable=bad-whitespace
 
 # ----------------------------------------------------------------------------
 class GaitBase(object):
-  """Gait base class"""
+  """Gait base class; the phases are precompiled into tables (see
+     `_compile()`), either by the derived class or from a gait blob (see
+     `load()`)"""
   # pylint: disable=bad-whitespace
   NORMAL        = const(1)
   REVERSE       = const(-1)
@@ -27,6 +46,10 @@ class GaitBase(object):
     self._gaitType = "n/a"
     self._subtypes = [0]
     self._subtype = 0
+    self._traject = sma.TRJ_SINE
+    self._blob = None
+    self._out = array.array("h", [0]*cfg.SRV_COUNT)
+    self._res = [0, self._out, 0]
     self.reset()
 
   def reset(self):
@@ -34,15 +57,216 @@ class GaitBase(object):
     """
     self._isInSeq = False
     self._phase = 0
+    self._nPhase = 1
+    self._lastRev = False
     self._seq = NORMAL
     self._aCoxaSwing_deg = 0
     self._aLgLift_deg = 0
+    self._tab = None
+    self._dtTab = None
+    self._trjTab = None
+    if self._blob:
+      # Parameters from gait blob
+      prm = self._blob[1]
+      self._aCoxaSwing_deg = prm[0]
+      self._aMaxCoxa_deg = prm[1]
+      self._aLgLift_deg = prm[2]
+      self._aLgDown_deg = prm[3]
+      self._tPhase_ms = prm[4]
+      self._aCoxaCenter_deg = 0
+      self._compile()
 
+  def load(self, data):
+    """ Load a data-driven gait from a blob (`bytes` or the name of a file),
+        as created by the host tool `hexbotling_gait_packer.py`
+    """
+    if isinstance(data, str):
+      with open(data, "rb") as f:
+        data = f.read()
+    gb = blob.unpack(data)
+    self._blob = gb
+    self._gaitType = gb[0]
+    self._subtypes = [0]
+    self._subtype = 0
+    self._legSets = [blob.legs_in_group(m) for m in gb[2]]
+    self.reset()
+    glb.toLog("Gait `{0}` loaded ({1} phases)".format(gb[0], self._nPhase))
+
+  @micropython.native
   def get_next_servo_pos(self, stop=False, turn_dir=0, rev=False):
-    """ Returns a tuple consisting of the duration of the move (in ms) and an
-        array of angles for all servos for the current gait and phase).
+    """ Returns a list consisting of the duration of the move (in ms), an
+        array of angles for all servos for the current gait and phase, and
+        the trajectory type, or None if no gait is loaded.
+        -1 <= `turn_dir` <= 1 gives the turn strength and direction.
+        `rev` == True inverses the sequence.
+        If `stop` is True, `turn_dir` is ignored.
+        The angles are looked up in the precompiled tables and copied into
+        the same output array each time, and the same list is returned;
+        hence the result is only valid until the next call (copy it to keep
+        it; `ServoManager.move()` and `queue()` convert the angles right
+        away), but the call does not allocate memory.
+    """
+    tab = self._tab
+    if tab is None:
+      return None
+    n = cfg.SRV_COUNT
+    nP = self._nPhase
+    dt_ms = self._tPhase_ms
+    trj = self._traject
+    if stop:
+      # Stopped, move to neutral position
+      ofs = (3*nP +1) *n
+      self._isInSeq = False
+      self._phase = 0
+
+    else:
+      phs = self._phase
+      if not self._isInSeq and phs == 0:
+        # Not yet running, lift legs from neutral position
+        ofs = 3*nP *n
+      else:
+        iT = 0
+        if turn_dir > 0.001:
+          iT = 1
+        elif turn_dir < -0.001:
+          iT = 2
+        ofs = (iT *nP +phs) *n
+      self._isInSeq = True
+      dt_ms = self._dtTab[phs +(nP if rev else 0)]
+      if self._trjTab and self._trjTab[phs]:
+        trj = self._trjTab[phs]
+
+      self._lastRev = rev
+      if not rev:
+        self._phase = phs +1 if phs < nP-1 else 0
+      else:
+        self._phase = phs -1 if phs > 0 else nP-1
+
+    # Copy angles into output array
+    out = self._out
+    for i in range(n):
+      out[i] = tab[ofs +i]
+    res = self._res
+    res[0] = dt_ms
+    res[2] = trj
+    return res
+
+  def rewind(self, n=1):
+    """ Go back `n` phases, e.g. to re-plan phases that were already
+        returned by `get_next_servo_pos()` but not (completely) executed
+    """
+    d = -1 if self._lastRev else 1
+    self._phase = (self._phase -d*n) % self._nPhase
+
+  def switch_subtype(self, val):
+    """ Change the subtype while walking: the new subtype continues with the
+        phase that follows the one whose pose matches the pose of the current
+        phase best (that is the phase before `phase`, see `rewind()`); the
+        gait parameters (swing and lift angle, sequence) are kept
+    """
+    val = val if val in self._subtypes else 0
+    if val == self._subtype:
+      return
+    n = cfg.SRV_COUNT
+    inSeq = self._isInSeq and self._tab is not None
+    rev = self._lastRev
+    d = -1 if rev else 1
+    if inSeq:
+      # Pose of the current phase
+      ofs = ((self._phase -d) % self._nPhase) *n
+      pos = self._tab[ofs:ofs +n]
+    prm = (self._seq, self._aCoxaSwing_deg, self._aLgLift_deg)
+    self._set_subtype(val)
+    self._seq, self._aCoxaSwing_deg, self._aLgLift_deg = prm
+    self._compile()
+    if inSeq and self._tab is not None:
+      # Find phase with the most similar pose (straight walking); if there
+      # are several, the one that is followed by the smallest move
+      tab = self._tab
+      nP = self._nPhase
+      eMin = None
+      iMin = 0
+      for iP in range(nP):
+        ofs = iP *n
+        ofn = ((iP +d) % nP) *n
+        e = 0
+        en = 0
+        for i in range(n):
+          e += abs(tab[ofs +i] -pos[i])
+          en += abs(tab[ofn +i] -pos[i])
+        if eMin is None or (e, en) < eMin:
+          eMin = (e, en)
+          iMin = iP
+      self._phase = (iMin +d) % nP
+      self._isInSeq = True
+      self._lastRev = rev
+
+  def _compile(self):
+    """ Compile the gait into tables: the servo angles for each phase and
+        turn direction (straight, right, left), followed by the start (lifting
+        legs from neutral) and the stop pose, the duration of each phase for
+        both directions and, optionally, the trajectory type of each phase;
+        here for a gait blob, derived classes with hand-coded phases override
+        this
+    """
+    if not self._blob:
+      return
+    n = cfg.SRV_COUNT
+    phases = self._blob[3]
+    nP = len(phases)
+    nG = len(self._legSets)
+    asw = self._aCoxaSwing_deg if self._seq == NORMAL else -self._aCoxaSwing_deg
+    alf = self._aLgLift_deg
+    adn = self._aLgDown_deg
+    dtp = self._tPhase_ms
+    self._nPhase = nP
+    tab = array.array("h", [0]*(3*nP +2)*n)
+    dtt = array.array("h", [0]*2*nP)
+    trt = bytearray(nP)
+
+    for iP, (fw, rv, trj, cox, fem) in enumerate(phases):
+      # Targets are given in % of the swing angle and of the down-to-lift
+      # range of the femur
+      dtt[iP] = dtp *fw //100
+      dtt[nP +iP] = dtp *rv //100
+      trt[iP] = trj
+      for iT, (tlc, trc) in enumerate(TURN):
+        ofs = (iT *nP +iP) *n
+        for iG in range(nG):
+          self._set_leg(
+              tab, ofs, self._legSets[iG], asw *cox[iG] /100,
+              adn +(alf -adn) *fem[iG] /100, tlc, trc
+            )
+
+    # Phase 0 when starting from neutral (no swing), and stop (neutral)
+    ofs = 3 *nP *n
+    fem = phases[0][4]
+    for iG in range(nG):
+      self._set_leg(
+          tab, ofs, self._legSets[iG], 0, adn +(alf -adn) *fem[iG] /100
+        )
+      self._set_leg(tab, ofs +n, self._legSets[iG], self._aCoxaCenter_deg, adn)
+    self._tab = tab
+    self._dtTab = dtt
+    self._trjTab = trt
+
+  def _set_leg(self, tab, ofs, legs, a_cox, a_fem, d_coxL=1, d_coxR=1):
+    for iL in legs:
+      # (even leg index -> left side leg, odd -> right side leg)
+      pol = d_coxL if iL % 2 == 0 else d_coxR
+      tab[ofs +cfg.SRV_COX[iL]] = int(a_cox) *cfg.SRV_COX_DIR[iL] *pol
+      tab[ofs +cfg.SRV_FEM[iL]] = int(a_fem)
+
+  def _changed(self):
+    """ Called when gait parameters were changed
     """
-    return None
+    self._compile()
+
+  def _set_subtype(self, val):
+    val = val if val in self._subtypes else 0
+    if self._subtype != val:
+      self._subtype = val
+      self.reset()
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   """ Gait subtype """
@@ -53,6 +277,15 @@ class GaitBase(object):
   def subtype(self, val):
     self._set_subtype(val)
 
+  """ Trajectory type of the moves (see `ServoManager.TRJ_xxx`), or a list
+      with a trajectory type for each servo """
+  @property
+  def trajectory(self):
+    return self._traject
+  @trajectory.setter
+  def trajectory(self, val):
+    self._traject = val
+
   """ Leg swing angle (in degrees) """
   @property
   def leg_swing_angle(self):
@@ -61,6 +294,7 @@ class GaitBase(object):
   def swing_angle(self, val):
     amax = self._aMaxCoxa_deg
     self._aCoxaSwing_deg = min(max(val, -amax), amax)
+    self._changed()
 
   """ Leg lift angle (in degrees) """
   @property
@@ -69,6 +303,12 @@ class GaitBase(object):
   @leg_lift_angle.setter
   def leg_lift_angle(self, val):
     self._aLgLift_deg = val
+    self._changed()
+
+  """ Femur angle with the foot on the ground (in degrees) """
+  @property
+  def leg_down_angle(self):
+    return self._aLgDown_deg
 
   """ Gait sequence, `NORMAL` or `REVERSE` """
   @property
@@ -78,6 +318,7 @@ class GaitBase(object):
   def sequence(self, val):
     if val in [NORMAL, REVERSE]:
       self._seq = val
+      self._changed()
 
   @property
   def phase(self):
@@ -89,5 +330,11 @@ class GaitBase(object):
     """ Returns `True` if gait can stop from this phase """
     return True
 
+  @property
+  def is_continuous(self):
+    """ Returns `True` if the gait is sampled in short steps instead of
+        consisting of phases """
+    return False
+
 
 # ----------------------------------------------------------------------------
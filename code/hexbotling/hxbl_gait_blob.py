@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------------
+# hxbl_gait_blob.py
+#
+# Binary format of data-driven gaits (see `GaitBase.load()`); used on the
+# robot and by the host tool that packs gait descriptions
+# (`hexbotling_gait_packer.py`)
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+#
+# Layout (little-endian):
+#   Header      magic "HXGT", version, # of leg groups (nG), # of phases (nP),
+#               name (12 chars), swing angle, max. swing angle, lift angle,
+#               down angle (all signed bytes, in degrees), phase time (ms)
+#   Groups      nG bytes, one leg mask each (bit i = leg i, see `LEG_NAMES`)
+#   Phases      nP times: duration forward and reverse (in % of the phase
+#               time), trajectory type (0=gait's default), and, for each
+#               group, the coxa and the femur target (signed bytes, in % of
+#               the swing angle and of down (0%) to lift angle (100%))
+#   Checksum    sum of all previous bytes (16 bit)
+# ----------------------------------------------------------------------------
+import struct
+try:
+  from micropython import const
+except ImportError:
+  const = lambda x: x
+
+# pylint: disable=bad-whitespace
+__version__   = "0.1.0.0"
+MAGIC         = b"HXGT"
+VERSION       = const(1)
+HEADER_FMT    = "<4sBBB12sbbbbH"
+HEADER_SIZE   = const(25)
+PHASE_FMT     = "<BBB"
+PHASE_SIZE    = const(3)
+MAX_NAME_LEN  = const(12)
+MAX_PHASES    = const(32)
+N_LEGS        = const(6)
+ALL_LEGS      = const(0x3F)
+LEG_NAMES     = ("FL", "FR", "CL", "CR", "BL", "BR")  # order of `LEG_xx`
+# pylint: enable=bad-whitespace
+
+# ----------------------------------------------------------------------------
+def pack(name, params, groups, phases):
+  """ Returns the blob for a gait named `name`, with `params` = (swing angle,
+      max. swing angle, lift angle, down angle, phase time), `groups` = list
+      of leg masks and `phases` = list of (forward %, reverse %, trajectory,
+      coxa %, femur %), with the coxa and femur targets as lists (one entry
+      per group)
+  """
+  nG = len(groups)
+  data = bytearray(struct.pack(
+      HEADER_FMT, MAGIC, VERSION, nG, len(phases),
+      name.encode()[:MAX_NAME_LEN], *params
+    ))
+  data.extend(bytes(groups))
+  for fw, rv, trj, cox, fem in phases:
+    data.extend(struct.pack(PHASE_FMT, fw, rv, trj))
+    for iG in range(nG):
+      data.extend(struct.pack("<bb", cox[iG], fem[iG]))
+  data.extend(struct.pack("<H", sum(data) & 0xFFFF))
+  unpack(data)
+  return bytes(data)
+
+def unpack(data):
+  """ Checks the blob `data` and returns its contents as a tuple (`name`,
+      `params`, `groups`, `phases`), see `pack()`; raises `ValueError` if the
+      blob is invalid
+  """
+  if len(data) < HEADER_SIZE +2:
+    raise ValueError("Gait blob too short")
+  mg, ver, nG, nP, name, *params = struct.unpack_from(HEADER_FMT, data, 0)
+  if mg != MAGIC or ver != VERSION:
+    raise ValueError("Not a gait blob or unsupported version")
+  n = HEADER_SIZE +nG +nP *(PHASE_SIZE +2*nG)
+  if len(data) != n +2:
+    raise ValueError("Gait blob has wrong size")
+  if struct.unpack_from("<H", data, n)[0] != sum(data[:n]) & 0xFFFF:
+    raise ValueError("Gait blob checksum mismatch")
+  if nP < 1 or nP > MAX_PHASES:
+    raise ValueError("Invalid number of gait phases")
+
+  # Leg groups must not overlap and cover all legs
+  groups = bytes(data[HEADER_SIZE:HEADER_SIZE +nG])
+  m = 0
+  for g in groups:
+    if g & m:
+      raise ValueError("Leg groups overlap")
+    m |= g
+  if m != ALL_LEGS:
+    raise ValueError("Leg groups do not cover all legs")
+
+  phases = []
+  ofs = HEADER_SIZE +nG
+  for _ in range(nP):
+    fw, rv, trj = struct.unpack_from(PHASE_FMT, data, ofs)
+    ofs += PHASE_SIZE
+    tgt = struct.unpack_from("<" +"b"*2*nG, data, ofs)
+    ofs += 2*nG
+    phases.append((fw, rv, trj, tgt[0::2], tgt[1::2]))
+  name = name.split(b"\0")[0].decode()
+  return name, tuple(params), groups, phases
+
+def legs_in_group(mask):
+  """ Returns the leg indices in the group `mask` as a `bytearray`
+  """
+  return bytearray([i for i in range(N_LEGS) if mask & (1 << i)])
+
+# ----------------------------------------------------------------------------
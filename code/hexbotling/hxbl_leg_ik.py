@@ -0,0 +1,125 @@
+# ----------------------------------------------------------------------------
+# hxbl_leg_ik.py
+#
+# Inverse kinematics of the 2-DOF legs (coxa and femur) using precomputed
+# tables
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+#
+# Leg geometry (seen from above and from the front of the leg):
+# - The femur axis is `coxa_mm` away from the coxa axis.
+# - With the femur horizontal (0 deg), the foot is `femur_mm` further out
+#   and `tibia_mm` below the femur axis (the tibia is rigid).
+# Lifting the femur by `b` raises the foot and pulls it in; swinging the
+# coxa by `a` moves it on a circle. The foot target is given as the position
+# along the stride `s` (in mm, from the neutral position along the body
+# axis, positive in the direction of positive coxa angles) and the height
+# `h` above the ground (in mm). As the leg has only two joints, the height
+# alone sets the femur angle; the coxa angle then sets the foot to `s`, so
+# that a stance with `s` changing linearly moves the foot with a constant
+# velocity along the body (not on an arc with a varying velocity, as with
+# linearly changing coxa angles). Both are looked up in tables with a step
+# of `step_mm` (coxa: 2-D, over `s` and `h`; femur: 1-D, over `h`) and
+# interpolated using integer math.
+# ----------------------------------------------------------------------------
+import array
+import math
+import micropython
+from micropython import const
+
+# pylint: disable=bad-whitespace
+__version__  = "0.1.0.0"
+_Q           = const(8)        # fractional bits of table indices
+_Q_ONE       = const(256)
+# pylint: enable=bad-whitespace
+
+# ----------------------------------------------------------------------------
+class LegIK(object):
+  """Inverse kinematics for a 2-DOF leg, using precomputed tables"""
+
+  def __init__(self, coxa_mm, femur_mm, tibia_mm, a_down_deg, s_max_mm=40,
+               h_max_mm=40, step_mm=2):
+    """ Computes the tables for a leg with the geometry `coxa_mm`,
+        `femur_mm` and `tibia_mm` (see above); `a_down_deg` is the femur
+        angle of the neutral position (foot on the ground, `h`=0). Targets
+        within +/-`s_max_mm` and 0..`h_max_mm` are supported; both ranges
+        have to span at least one step (`step_mm`) of the tables.
+    """
+    if step_mm <= 0 or h_max_mm < step_mm or 2*s_max_mm < step_mm:
+      raise ValueError("Ranges must span at least one step of {0} mm"
+                       .format(step_mm))
+    self._step = step_mm
+    self._sMax = s_max_mm
+    self._hMax = h_max_mm
+    nS = 2*s_max_mm //step_mm +1
+    nH = h_max_mm //step_mm +1
+    self._nS = nS
+    self._nH = nH
+    self._out = array.array("h", [0, 0])
+
+    # Foot relative to the femur axis in polar coordinates: distance `d`,
+    # and angle below the horizontal `g` (with the femur at 0 deg)
+    d = math.sqrt(femur_mm**2 +tibia_mm**2)
+    g = math.atan2(tibia_mm, femur_mm)
+    b0 = math.radians(a_down_deg)
+    z0 = d *math.sin(b0 -g)
+
+    # Tables (in 1/100 deg), the coxa table row-wise for each height
+    self._tFem = array.array("h", [0]*nH)
+    self._tCox = array.array("h", [0]*nH*nS)
+    for iH in range(nH):
+      # Femur angle that lifts the foot to `h` (limited to what the leg can
+      # reach) and the resulting horizontal distance of the foot
+      z = min((z0 +iH *step_mm) /d, 1.)
+      b = g +math.asin(z)
+      rho = coxa_mm +d *math.cos(b -g)
+      self._tFem[iH] = int(round(math.degrees(b) *100))
+      for iS in range(nS):
+        s = -s_max_mm +iS *step_mm
+        a = math.asin(min(max(s /rho, -1.), 1.))
+        self._tCox[iH*nS +iS] = int(round(math.degrees(a) *100))
+
+  @micropython.native
+  def angles(self, s_mm, h_mm):
+    """ Returns the coxa and femur angles (in degrees, as integers) for the
+        foot position `s_mm` along the stride and the height `h_mm`; targets
+        out of range are limited. The angles are written into the same
+        output array each time, hence the result is only valid until the
+        next call, but the call does not allocate memory.
+    """
+    st = self._step
+    smx = self._sMax
+    nS = self._nS
+    s = min(max(s_mm, -smx), smx)
+    h = min(max(h_mm, 0), self._hMax)
+
+    # Table indices and fractions (`_Q` bits)
+    xs = int((s +smx) *_Q_ONE) //st
+    xh = int(h *_Q_ONE) //st
+    iS = min(xs >> _Q, nS -2)
+    iH = min(xh >> _Q, self._nH -2)
+    fs = xs -(iS << _Q)
+    fh = xh -(iH << _Q)
+
+    # Femur: linear, coxa: bilinear interpolation
+    tf = self._tFem
+    af = tf[iH] +(((tf[iH +1] -tf[iH]) *fh) >> _Q)
+    tc = self._tCox
+    i = iH *nS +iS
+    c0 = tc[i] +(((tc[i +1] -tc[i]) *fs) >> _Q)
+    i += nS
+    c1 = tc[i] +(((tc[i +1] -tc[i]) *fs) >> _Q)
+    ac = c0 +(((c1 -c0) *fh) >> _Q)
+    out = self._out
+    out[0] = (ac +50) //100
+    out[1] = (af +50) //100
+    return out
+
+  @property
+  def range_mm(self):
+    """ Supported targets as a tuple (+/-stride, max. height), in mm """
+    return self._sMax, self._hMax
+
+# ----------------------------------------------------------------------------
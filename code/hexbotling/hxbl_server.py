@@ -6,6 +6,7 @@
 # The MIT License (MIT)
 # Copyright (c) 2022 Thomas Euler
 # 2022-05-04, v1.0
+# 2026-10-18, v1.1 - Gait changes are handed to the walk engine
 # ----------------------------------------------------------------------------
 import time
 import hxbl_config as cfg
@@ -18,7 +19,7 @@ from robotling_lib.misc.helpers import timed_function
 import robotling_lib.misc.ansi_color as ansi
 
 # pylint: disable=bad-whitespace
-__version__  = "0.1.0.0"
+__version__  = "0.1.1.0"
 
 # Global variables to communicate with task on core 1
 # (Do not access other than via the `Server` instance!!)
@@ -200,7 +201,8 @@ class Server(HexbotlingBase):
     if lift_deg is not None:
       g_we._Gait.leg_lift_angle = lift_deg
     if type is not None:
-      g_we._Gait.subtype = type
+      # (switched by the walk engine, while walking at the next phase)
+      g_we.set_gait(type)
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   #@timed_function
@@ -6,6 +6,16 @@
 # The MIT License (MIT)
 # Copyright (c) 2022 Thomas Euler
 # 2022-05-04, v1.0
+# 2026-10-18, v1.1 - Stop and direction changes take effect immediately
+# 2026-10-18, v1.2 - Velocity via the servo manager's time scale
+# 2026-10-18, v1.3 - Trajectory types for coxa and femur joints
+# 2026-10-18, v1.4 - Next phase is queued when the servo manager signals
+#                    the end of a phase
+# 2026-10-18, v1.5 - Optional PIO+DMA servo pulse engine
+# 2026-10-18, v1.6 - Data-driven gait from a blob file (`GAIT_FILE`)
+# 2026-10-18, v1.7 - Continuous CPG gait (`GAIT_CPG`)
+# 2026-10-18, v1.8 - Optional leg kinematics for the CPG gait (`GAIT_IK`)
+# 2026-10-18, v1.9 - Gait subtype changes w/o stopping (`set_gait()`)
 # ----------------------------------------------------------------------------
 import sys
 import array
@@ -13,7 +23,10 @@ import time
 import hxbl_config as cfg
 import hxbl_global as glb
 from time import sleep_ms, ticks_ms, ticks_diff
+from hxbl_gait_base import GaitBase
 from hxbl_tripod_gait2 import TripodGait
+from hxbl_cpg_gait import CPGGait
+from hxbl_leg_ik import LegIK
 from micropython import const
 from pimoroni import Analog, AnalogMux, Button
 from servo import servo2040
@@ -21,13 +34,19 @@ from plasma import WS2812
 from machine import Pin
 from robotling_lib.motors.servo_manager import ServoManager
 from robotling_lib.motors.servo2040 import Servo
+from robotling_lib.motors.servo2040_cluster import ServoCluster
+from robotling_lib.motors.servo_pio_dma import ServoPIODMA
 from robotling_lib.misc.helpers import timed_function, TemporalFilter
 from robotling_lib.misc.pulse_pixel_led import PulsePixelLED_Hue
 
 # pylint: disable=bad-whitespace
-__version__  = "0.1.0.0"
+__version__  = "0.1.9.0"
 MIN_DIR_VAL  = 0.15
 MIN_VEL_VAL  = 0.10
+MIN_PHASE_MS = 100
+MAX_PHASE_MS = 1500
+MIN_T_SCALE  = 0.5   # limits for the time scale, which keep the phases of
+MAX_T_SCALE  = 3.0   # .. the gait within ~MIN_PHASE_MS...MAX_PHASE_MS
 # pylint: enable=bad-whitespace
 
 # ----------------------------------------------------------------------------
@@ -46,8 +65,12 @@ class WalkEngine(object):
 
     # Define walk control variables
     self._vel = 1.
+    self._tScale = 1.
     self._dir = 0.
     self._rev = False
+    self._isReplan = False
+    self._isPlanning = False
+    self._nextGait = None
 
     # Configure LEDs
     self._LEDs = WS2812(servo2040.NUM_LEDS, 1, 0, servo2040.LED_DATA)
@@ -82,24 +105,82 @@ class WalkEngine(object):
     self._user_sw = Button(servo2040.USER_SW)
 
     # Configure servos and servo manager
+    # (if `SRV_CLUSTER`, all servos share one PIO-driven cluster, which allows
+    # the servo manager to update them with one load per tick; with
+    # `SRV_PIO_DMA`, the pulses are generated by PIO and DMA from a table,
+    # and the servo manager just updates that table)
     self._Servos = []
-    self._SM = ServoManager(cfg.SRV_COUNT)
-    for i, pin in enumerate(cfg.SRV_PIN):
-      srv = Servo(
-          pin, us_range=cfg.SRV_RANGE_US[i],
-          ang_range=cfg.SRV_RANGE_DEG[i % 2]
+    self._SM = ServoManager(
+        cfg.SRV_COUNT, rate_ms=cfg.SRV_RATE_MS, hard_irq=cfg.SRV_HARD_IRQ,
+        core1=cfg.SRV_CORE1 and not cfg.HW_CORE
+      )
+    isCluster = cfg.SRV_CLUSTER or cfg.SRV_PIO_DMA
+    if cfg.SRV_PIO_DMA:
+      self._Cluster = ServoPIODMA(cfg.SRV_PIN, pio=cfg.SRV_PIO_DMA_PIO)
+    elif cfg.SRV_CLUSTER:
+      self._Cluster = ServoCluster(
+          cfg.SRV_PIN, pio=cfg.SRV_CLUSTER_PIO, sm=cfg.SRV_CLUSTER_SM
         )
+    for i, pin in enumerate(cfg.SRV_PIN):
+      if isCluster:
+        srv = self._Cluster.servo(
+            i, us_range=cfg.SRV_RANGE_US[i],
+            ang_range=cfg.SRV_RANGE_DEG[i % 2]
+          )
+      else:
+        srv = Servo(
+            pin, us_range=cfg.SRV_RANGE_US[i],
+            ang_range=cfg.SRV_RANGE_DEG[i % 2]
+          )
+      if i in cfg.SRV_CALIB_POINTS:
+        srv.set_calibration(cfg.SRV_CALIB_POINTS[i])
       self._Servos.append(srv)
       self._SM.add_servo(cfg.SRV_ID[i], srv)
     self._SM.trajectory = ServoManager.TRJ_SINE
+    self._SM.blend_ms = cfg.GAIT_BLEND_MS
+    self._SM.wall_clock = cfg.SRV_WALL_CLOCK
+    self._cbPhaseEnd = self._on_phase_end
+    self._SM.set_callback(self._cbPhaseEnd)
     glb.toLog("Servo manager ready", green=True)
     if len(cfg.CALIBRATE) > 0:
       # If list of servo IDs is not empty, start interactive calibration ...
       self._SM.calibrate(cfg.CALIBRATE)
       sys.exit()
 
-    # Create gait object
-    self._Gait = TripodGait()
+    # Create gait object; with spline trajectories, the joint velocities are
+    # carried through the phase boundaries (where joints keep their direction)
+    if cfg.GAIT_CPG:
+      # (the step is a multiple of the tick period; if that is auto-tuned,
+      # the moves are timed by the clock instead)
+      self._Gait = CPGGait(cfg.CPG_STEP_MS, self._SM.rate_ms)
+      if self._SM.auto_rate:
+        self._SM.wall_clock = True
+      if cfg.GAIT_IK:
+        # Feet move on straight lines, with stride and lift in mm
+        self._Gait.kinematics = LegIK(
+            cfg.LEG_COXA_MM, cfg.LEG_FEMUR_MM, cfg.LEG_TIBIA_MM,
+            self._Gait.leg_down_angle
+          )
+        self._Gait.stride_mm = cfg.IK_STRIDE_MM
+        self._Gait.lift_mm = cfg.IK_LIFT_MM
+      self._Gait.frequency = cfg.CPG_FREQ_HZ
+      self._Gait.duty_factor = cfg.CPG_DUTY
+    elif cfg.GAIT_FILE:
+      self._Gait = GaitBase()
+      self._Gait.load(cfg.GAIT_FILE)
+    else:
+      self._Gait = TripodGait()
+    if cfg.GAIT_SPLINE:
+      self._Gait.trajectory = ServoManager.TRJ_SPLINE
+    if cfg.GAIT_COXA_TRJ or cfg.GAIT_FEMUR_TRJ:
+      # Different trajectory types for swinging and lifting the legs
+      trj = self._Gait.trajectory
+      trl = bytearray([trj]*cfg.SRV_COUNT)
+      for i in cfg.SRV_COX:
+        trl[i] = cfg.GAIT_COXA_TRJ if cfg.GAIT_COXA_TRJ else trj
+      for i in cfg.SRV_FEM:
+        trl[i] = cfg.GAIT_FEMUR_TRJ if cfg.GAIT_FEMUR_TRJ else trj
+      self._Gait.trajectory = trl
 
     # Getting ready ...
     self._LEDs.start(cfg.LEDS_FREQ)
@@ -125,20 +206,37 @@ class WalkEngine(object):
         .format(self._servoI_minmax[0], self._servoI_minmax[1]),
         head=False
       )
+    st = self._SM.stats
+    glb.toLog(
+        "Servo tick : {0} us (max. {1} us), jitter {2} us, {3} late, "
+        "{4} overrun(s)"
+        .format(st["cb_us"][1], st["cb_us"][2], st["jitter_us"], st["late"],
+                st["overruns"]),
+        head=False
+      )
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   def to_neutral(self, dt_ms=0):
     """ Assume neutral position
     """
     res = self._Gait.get_next_servo_pos(stop=True)
+    self._SM.time_scale = 1
     self._SM.move(cfg.SRV_ID, res[1], dt_ms)
     sleep_ms(1000 if dt_ms <= 0 else dt_ms +200)
+    self._wait_for_move()
 
   def to_resting(self, dt_ms=2000):
     """ Assume resting position
     """
+    self._SM.time_scale = 1
     self._SM.move(cfg.SRV_ID, cfg.SRV_RESTING_DEG, dt_ms)
     sleep_ms(1000 if dt_ms <= 0 else dt_ms +200)
+    self._wait_for_move()
+
+  def _wait_for_move(self):
+    # (the move may take longer than `dt_ms`, depending on the time scale)
+    while self._SM.is_moving:
+      sleep_ms(20)
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   def walk(self):
@@ -181,29 +279,96 @@ class WalkEngine(object):
       self.update_analog_sensors()
 
     # Update walk engine
+    self._plan()
+
+  def _on_phase_end(self, n_queued):
+    # Called (scheduled) by the servo manager when a phase has ended; if the
+    # main program is not just planning, queue next phase right away
+    if not self._isPlanning:
+      self._plan()
+
+  def _plan(self):
+    """ Queue the gait phases in the servo manager `GAIT_LOOKAHEAD` phases
+        in advance, such that the manager can go from one phase to the next
+        without stopping
+    """
+    self._isPlanning = True
+    try:
+      self._plan_phases()
+    finally:
+      self._isPlanning = False
+
+  def _plan_phases(self):
     st = self._state
     sm = self._SM
-    if st == glb.STA_IDLE or sm.is_moving:
-      # Walk engine is idle or still executing the next move
+    if self._nextGait is not None:
+      self._switch_gait()
+    if st == glb.STA_IDLE:
       return
 
     dr = self._dir
     rv = self._rev
-    if st in [glb.STA_WALKING, glb.STA_REVERSING, glb.STA_TURNING]:
-      # Execute next move after applying direction
+    if st == glb.STA_STOPPING:
+      # Stop: discard queued phases and move to neutral from where the legs
+      # currently are (with the configured duration, independent of the
+      # velocity)
+      dt, ang, trj = self._Gait.get_next_servo_pos(stop=True)
+      sm.time_scale = 1
+      sm.move(cfg.SRV_ID, ang, dt, trj)
+      self._state = glb.STA_IDLE
+      return
+
+    if st not in [glb.STA_WALKING, glb.STA_REVERSING, glb.STA_TURNING]:
+      return
+
+    if self._isReplan:
+      # Turn direction or sequence changed: discard queued phases, rewind
+      # the gait to the current phase and re-plan it with the new parameters
+      # for the remaining time of that phase
+      self._isReplan = False
+      if sm.is_moving:
+        n = sm.queued +1
+        dt_ms = max(sm.remaining_ms, MIN_PHASE_MS)
+        self._Gait.rewind(n)
+        _, ang, trj = self._Gait.get_next_servo_pos(turn_dir=dr, rev=rv)
+        sm.move(cfg.SRV_ID, ang, dt_ms, trj)
+
+    if sm.queued < cfg.GAIT_LOOKAHEAD:
+      # Queue next move after applying direction; the phases are planned
+      # with their nominal duration, the velocity is applied by the servo
+      # manager (see `set_params()`)
       dt, ang, trj = self._Gait.get_next_servo_pos(turn_dir=dr, rev=rv)
-      dt_ms = min(max(int(dt /self._vel), 100), 1500)
+      if not self._Gait.is_continuous:
+        dt_ms = min(max(dt, MIN_PHASE_MS), MAX_PHASE_MS)
+        sm.time_scale = self._tScale
+      else:
+        dt_ms = dt
       #print(dt, dt_ms, ang, self._vel)
       #print("WE_MOVE", time.ticks_diff(time.ticks_ms(), self._tLastMsg), "ms")
-      sm.trajectory = trj
-      sm.move(cfg.SRV_ID, ang, dt_ms)
+      sm.queue(cfg.SRV_ID, ang, dt_ms, trj)
+
+  def _switch_gait(self):
+    # Change the gait subtype; while walking, the phases planned beyond the
+    # current one are discarded and the new subtype continues from the phase
+    # that matches the current one, i.e. it takes over at the next phase
+    # boundary (continuous gaits change smoothly by themselves)
+    gait = self._Gait
+    sm = self._SM
+    val = self._nextGait
+    self._nextGait = None
+    if (self._state in [glb.STA_WALKING, glb.STA_REVERSING, glb.STA_TURNING]
+        and sm.is_moving and not gait.is_continuous):
+      gait.rewind(sm.clear_queue())
+      gait.switch_subtype(val)
+    else:
+      gait.subtype = val
+    glb.toLog("Gait subtype {0}".format(gait.subtype))
 
-    elif st == glb.STA_STOPPING:
-      # Execute stop
-      dt, ang, trj = self._Gait.get_next_servo_pos(stop=True)
-      sm.trajectory = trj
-      sm.move(cfg.SRV_ID, ang, dt)
-      self._state = glb.STA_IDLE
+  def set_gait(self, subtype):
+    """ Change the gait subtype with the next call of `spin()`; while
+        walking, w/o stopping (see `_switch_gait()`)
+    """
+    self._nextGait = subtype
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   @property
@@ -214,15 +379,38 @@ class WalkEngine(object):
   def is_button_pressed(self):
     return self._user_sw.read()
 
-  def set_params(self, dir, rev, vel):
+  def set_params(self, dir, rev, vel, swing=None, duty=None):
     """ Set movement parameters direction (with `dir` <0.1, left turn; >0.1,
         right turn; 0, straight ahead), normal or reverse (`rev` == True),
-        and velocity (with `vel` <1, slower; >1 faster).
+        and velocity (with `vel` <1, slower; >1 faster); for continuous
+        gaits, optionally also the swing angle (`swing`, in degrees) and the
+        duty factor (`duty`).
     """
     d = max(min(dir, 1.0), -1.0) if dir is not None else self._dir
-    self._dir = d if abs(d) >= MIN_DIR_VAL else 0
-    self._rev = bool(rev) if rev is not None else self._rev
+    d = d if abs(d) >= MIN_DIR_VAL else 0
+    r = bool(rev) if rev is not None else self._rev
+    gait = self._Gait
+    if r != self._rev or (d > 0) != (self._dir > 0) or (d < 0) != (self._dir < 0):
+      # Gait only depends on the sign of the turn direction (continuous
+      # gaits follow changes smoothly w/o re-planning)
+      self._isReplan = not gait.is_continuous
+    self._dir = d
+    self._rev = r
     self._vel = max(vel, MIN_VEL_VAL) if vel is not None else self._vel
+    if gait.is_continuous:
+      # Velocity sets the step frequency, which the gait approaches smoothly
+      gait.frequency = cfg.CPG_FREQ_HZ *self._vel
+      if swing is not None:
+        gait.swing_angle = swing
+      if duty is not None:
+        gait.duty_factor = duty
+    else:
+      # Velocity changes take effect immediately, also for the ongoing phase;
+      # it only applies to gait phases (see `_plan_phases()`), not to moves
+      # to the neutral or resting position
+      self._tScale = min(max(self._vel, MIN_T_SCALE), MAX_T_SCALE)
+      if self._state in [glb.STA_WALKING, glb.STA_REVERSING, glb.STA_TURNING]:
+        self._SM.time_scale = self._tScale
 
   def get_params(self):
     """ Returns direction, normal or reverse, and velocity as a tuple.
@@ -6,6 +6,7 @@
 # The MIT License (MIT)
 # Copyright (c) 2022 Thomas Euler
 # 2022-03-21, v1.0
+# 2026-10-18, v1.1 - Gait changes w/o stopping
 # ----------------------------------------------------------------------------
 import sys
 import time
@@ -40,8 +41,8 @@ def handleCmd(msgData):
     RSrv.stop(wait_for_neutral=True)
 
   elif msgID == com.MSG_GAIT:
-    # Change gait
-    RSrv.stop(wait_for_neutral=True)
+    # Change gait; while walking, the walk engine switches at the next phase
+    # boundary, w/o stopping
     RSrv.set_gait_parameters(type=params[0])
 
   elif msgID == com.MSG_MOVE:
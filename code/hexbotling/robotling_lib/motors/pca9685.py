@@ -0,0 +1,224 @@
+# ----------------------------------------------------------------------------
+# pca9685.py
+# Servos connected to a PCA9685 16-channel I2C PWM expander
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1
+#
+# New timings are staged in a preallocated buffer that mirrors the channel
+# registers; `load()` then writes the channels from the first to the last
+# changed one in one auto-increment burst, that is one I2C transaction per
+# tick of the `ServoManager`.
+# ----------------------------------------------------------------------------
+from time import sleep_ms
+from micropython import const
+import robotling_lib.misc.ansi_color as ansi
+from robotling_lib.misc.helpers import timed_function
+from robotling_lib.motors.servo_base import ServoBase
+
+# pylint: disable=bad-whitespace
+__version__        = "0.1.0.0"
+CHIP_NAME          = "pca9685"
+DEF_RANGE_DEG      = (0, 180)
+DEF_RANGE_US       = (500, 2500)
+
+ADDRESS_PCA9685    = const(0x40)
+MAX_CHAN           = const(16)
+OSC_FREQ           = const(25_000_000)
+
+_MODE1             = const(0x00)
+_MODE2             = const(0x01)
+_LED0_ON_L         = const(0x06)
+_PRESCALE          = const(0xFE)
+_MODE1_RESTART     = const(0x80)
+_MODE1_AI          = const(0x20)      # register auto-increment
+_MODE1_SLEEP       = const(0x10)
+_MODE2_OUTDRV      = const(0x04)
+_FULL_OFF          = const(0x10)      # in LEDn_OFF_H
+# pylint: enable=bad-whitespace
+
+# ----------------------------------------------------------------------------
+class PCA9685(object):
+  """Bundles the channels of a PCA9685 PWM expander; like `ServoCluster`,
+     it hands out servo objects for its channels that can be added to the
+     `ServoManager`, which then commits the staged timings of all servos with
+     one `load()` per tick."""
+
+  def __init__(self, i2c, addr=ADDRESS_PCA9685, freq=50, n_chan=MAX_CHAN,
+               verbose=False):
+    """ Initialises the device at address `addr` of the I2C bus `i2c` (an
+        object with `writeto(addr, buf)` and `writeto_mem(addr, reg, buf)`,
+        e.g. `machine.I2C`), for `n_chan` channels (0..n_chan-1) and the PWM
+        frequency `freq` (in Hz)
+    """
+    self._i2c = i2c
+    self._addr = addr
+    self._verbose = verbose
+    self._nChan = min(max(1, n_chan), MAX_CHAN)
+
+    # Channel registers (ON_L, ON_H, OFF_L, OFF_H for each channel), all off,
+    # the first and last changed channel, and a buffer for the burst, with a
+    # view for each number of channels
+    self._buf = bytearray(self._nChan *4)
+    self._burst = bytearray(self._nChan *4)
+    mv = memoryview(self._burst)
+    self._views = [mv[:i*4] for i in range(self._nChan +1)]
+    self._iFirst = self._nChan
+    self._iLast = -1
+    for i in range(self._nChan):
+      self._buf[i*4 +3] = _FULL_OFF
+
+    # Set PWM frequency (only possible in sleep mode) and enable auto-
+    # increment
+    pre = max(3, min(255, int(OSC_FREQ /(4096 *freq) +0.5) -1))
+    self._usPerFrame = 4096 *(pre +1) *1_000_000 //OSC_FREQ
+    self._reg = bytearray(2)
+    self._write_reg(_MODE1, _MODE1_SLEEP)
+    self._write_reg(_PRESCALE, pre)
+    self._write_reg(_MODE2, _MODE2_OUTDRV)
+    self._write_reg(_MODE1, _MODE1_AI)
+    sleep_ms(1)
+    self._write_reg(_MODE1, _MODE1_AI | _MODE1_RESTART)
+    self._iFirst = 0
+    self._iLast = self._nChan -1
+    self.load()
+    if verbose:
+      print("{0} at 0x{1:x}, {2} channels ({3} us/frame) ready."
+            .format(CHIP_NAME, addr, self._nChan, self._usPerFrame))
+
+  def servo(self, chan, us_range=DEF_RANGE_US, ang_range=DEF_RANGE_DEG,
+            us_limits=DEF_RANGE_US, verbose=False):
+    """ Returns a servo object for channel `chan` that can be added to the
+        `ServoManager` like a single servo
+    """
+    assert chan in range(self._nChan), "Invalid channel"
+    return PCA9685Servo(self, chan, us_range, ang_range, us_limits, verbose)
+
+  @property
+  def count(self):
+    return self._nChan
+
+  @micropython.native
+  def pulse(self, chan, t_us, load=True):
+    """ Stage the timing `t_us` (in us) for channel `chan`; if `load` is True,
+        it is written right away
+    """
+    n = t_us *4096 //self._usPerFrame
+    n = min(max(n, 0), 4095)
+    buf = self._buf
+    i = chan *4
+    buf[i+2] = n & 0xFF
+    buf[i+3] = n >> 8
+    if chan < self._iFirst:
+      self._iFirst = chan
+    if chan > self._iLast:
+      self._iLast = chan
+    if load:
+      self.load()
+
+  def disable(self, chan):
+    """ Turn channel `chan` off (no pulses)
+    """
+    self._buf[chan *4 +3] = _FULL_OFF
+    self._iFirst = min(self._iFirst, chan)
+    self._iLast = max(self._iLast, chan)
+    self.load()
+
+  @micropython.native
+  def load(self):
+    """ Write the staged timings of the channels from the first to the last
+        changed one in one burst (does not allocate memory)
+    """
+    i = self._iFirst
+    j = self._iLast
+    if i <= j:
+      buf = self._buf
+      bur = self._burst
+      k = i *4
+      for m in range((j -i +1) *4):
+        bur[m] = buf[k +m]
+      self._i2c.writeto_mem(self._addr, _LED0_ON_L +k, self._views[j -i +1])
+      self._iFirst = self._nChan
+      self._iLast = -1
+
+  def deinit(self):
+    """ Turn all channels off
+    """
+    try:
+      for i in range(self._nChan):
+        self._buf[i*4 +3] = _FULL_OFF
+      self._iFirst = 0
+      self._iLast = self._nChan -1
+      self.load()
+    except:
+      pass
+
+  def _write_reg(self, reg, val):
+    self._reg[0] = reg
+    self._reg[1] = val
+    self._i2c.writeto(self._addr, self._reg)
+
+# ----------------------------------------------------------------------------
+class PCA9685Servo(ServoBase):
+  """Single channel of a `PCA9685`, with the same interface as the other
+     servo classes."""
+
+  def __init__(self, device, chan, us_range=DEF_RANGE_US,
+               ang_range=DEF_RANGE_DEG, us_limits=DEF_RANGE_US,
+               verbose=False):
+    """ Initialises channel `chan` of the PCA9685 `device`, with the timing
+        (`us_range`) for the given angular range (`ang_range`), and the
+        timing limits (`us_limits`).
+    """
+    super().__init__(50, us_range, ang_range, us_limits, verbose)
+    # (`cluster` lets the `ServoManager` use `stage_us()` and `load()`)
+    self.cluster = device
+    self._chan = chan
+    if verbose:
+      print("Servo at {0} channel {1} ready.".format(CHIP_NAME, chan))
+
+  @property
+  def angle(self):
+    """ Report current angle (in degrees)
+    """
+    return self._angle
+
+  @angle.setter
+  def angle(self, value):
+    """ Move to the specified angle (in degrees)
+    """
+    self.write_us(self.angle_in_us(value))
+
+  def off(self):
+    """ Turn servo off
+    """
+    self.cluster.disable(self._chan)
+
+  def deinit(self):
+    """ Disable this channel
+    """
+    try:
+      self.cluster.disable(self._chan)
+    except:
+      pass
+
+  # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  @timed_function
+  def write_us_timed(self, t_us):
+    self.write_us(t_us)
+
+  def write_us(self, t_us):
+    """ Move to a position given by the timing (immediately)
+    """
+    self.cluster.pulse(self._chan, t_us, True)
+    if self._verbose:
+      print("chan={0}, t_us={1}".format(self._chan, t_us))
+
+  def stage_us(self, t_us):
+    """ Set the timing but do not yet output it; this happens for all
+        channels at once when the device's `load()` is called
+    """
+    self.cluster.pulse(self._chan, t_us, False)
+
+# ----------------------------------------------------------------------------
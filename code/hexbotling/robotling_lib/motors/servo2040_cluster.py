@@ -0,0 +1,130 @@
+# ----------------------------------------------------------------------------
+# servo2040_cluster.py
+# Encapsulates Pimoroni's servo cluster class, which drives several servos
+# from a single PIO state machine
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-17, v1
+# ----------------------------------------------------------------------------
+import robotling_lib.misc.ansi_color as ansi
+from robotling_lib.misc.helpers import timed_function
+from robotling_lib.motors.servo_base import ServoBase
+from servo import ServoCluster as _ServoCluster
+
+# pylint: disable=bad-whitespace
+__version__        = "0.1.0.0"
+DEF_RANGE_DEG      = (0, 180)
+DEF_RANGE_US       = (500, 2500)
+# pylint: enable=bad-whitespace
+
+# ----------------------------------------------------------------------------
+class ServoCluster(object):
+  """Bundles a number of servo outputs in one PIO-driven Pimoroni
+     `ServoCluster`; new pulse widths can be staged for all channels and are
+     then committed together with `load()` (same PWM frame for all servos)."""
+
+  def __init__(self, pins, pio=0, sm=0, freq=50, verbose=False):
+    """ Initialises the cluster for the list of `pins` using PIO `pio` and
+        state machine `sm`, with `freq` the frequency of the signal (in Hz)
+    """
+    self._verbose = verbose
+    self._pins = bytearray(pins)
+    self._cluster = _ServoCluster(pio, sm, pins=list(pins), freq=freq)
+    if verbose:
+      print("Servo cluster for {0} pins ({1} Hz) ready."
+            .format(len(pins), freq))
+
+  def servo(self, chan, us_range=DEF_RANGE_US, ang_range=DEF_RANGE_DEG,
+            us_limits=DEF_RANGE_US, verbose=False):
+    """ Returns a servo object for channel `chan` of the cluster that can be
+        added to the `ServoManager` like a single servo
+    """
+    return ClusterServo(self, chan, us_range, ang_range, us_limits, verbose)
+
+  @property
+  def count(self):
+    return len(self._pins)
+
+  def load(self):
+    """ Commit the staged pulse widths of all channels at once
+    """
+    self._cluster.load()
+
+  def pulse(self, chan, t_us, load=True):
+    self._cluster.pulse(chan, t_us, load)
+
+  def disable(self, chan):
+    self._cluster.disable(chan)
+
+  def deinit(self):
+    """ Disable all channels
+    """
+    try:
+      self._cluster.disable_all()
+    except:
+      pass
+
+# ----------------------------------------------------------------------------
+class ClusterServo(ServoBase):
+  """Single channel of a `ServoCluster`, with the same interface as the other
+     servo classes."""
+
+  def __init__(self, cluster, chan, us_range=DEF_RANGE_US,
+               ang_range=DEF_RANGE_DEG, us_limits=DEF_RANGE_US,
+               verbose=False):
+    """ Initialises channel `chan` of the servo cluster `cluster`, with the
+        timing (`us_range`) for the given angular range (`ang_range`), and the
+        timing limits (`us_limits`).
+    """
+    super().__init__(50, us_range, ang_range, us_limits, verbose)
+    self.cluster = cluster
+    self._cl = cluster._cluster
+    self._chan = chan
+    if verbose:
+      print("Servo at cluster channel {0} ready.".format(chan))
+
+  @property
+  def angle(self):
+    """ Report current angle (in degrees)
+    """
+    return self._angle
+
+  @angle.setter
+  def angle(self, value):
+    """ Move to the specified angle (in degrees)
+    """
+    self.write_us(self.angle_in_us(value))
+
+  def off(self):
+    """ Turn servo off
+    """
+    self.cluster.disable(self._chan)
+
+  def deinit(self):
+    """ Disable this channel
+    """
+    try:
+      self.cluster.disable(self._chan)
+    except:
+      pass
+
+  # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  @timed_function
+  def write_us_timed(self, t_us):
+    self.write_us(t_us)
+
+  def write_us(self, t_us):
+    """ Move to a position given by the timing (immediately)
+    """
+    self._cl.pulse(self._chan, t_us, True)
+    if self._verbose:
+      print("chan={0}, t_us={1}".format(self._chan, t_us))
+
+  def stage_us(self, t_us):
+    """ Set the timing but do not yet output it; this happens for all
+        channels at once when the cluster's `load()` is called
+    """
+    self._cl.pulse(self._chan, t_us, False)
+
+# ----------------------------------------------------------------------------
@@ -6,11 +6,13 @@
 # Copyright (c) 2018-2022 Thomas Euler
 # 2020-01-04, v1
 # 2022-05-05, v1.7, support limits to the timing
+# 2026-10-18, v1.8, Calibration compiled into a lookup table (angle -> us),
+#                   optionally w/ several calibration points
 # ----------------------------------------------------------------------------
 import array
 
 # pylint: disable=bad-whitespace
-__version__        = "0.1.0.0"
+__version__        = "0.1.8.0"
 # pylint: enabled=bad-whitespace
 
 # ----------------------------------------------------------------------------
@@ -33,13 +35,16 @@ class ServoBase(object):
     self._sign = 1
     self._speed = 0
     self._accel = 0
+    self._lut = None
+    self._calPoints = None
     self.change_range(us_range, ang_range, us_limits)
 
   def change_range(self, us_range, ang_range=[-90, 90],
                    us_limits=[500,2500], _sign=1):
     """ Sets the minimun and maximum supported timing (`us_range`), and the
         respective angular range (`ang_range`) covered; `_sign` determines the
-        sign of the input angle
+        sign of the input angle. Calibration points set with
+        `set_calibration()` are kept (and replace the two-point calibration)
     """
     self._range[0] = int(us_range[0])
     self._range[1] = int(us_range[1])
@@ -51,6 +56,49 @@ class ServoBase(object):
     self._range[6] = int(us_limits[0])
     self._range[7] = int(us_limits[1])
     self._sign = -1 if _sign < 0 else 1
+    r = self._range
+    if self._calPoints is None:
+      self._compile([(r[3], r[0]), (r[4], r[1])])
+    else:
+      self._compile(self._calPoints)
+
+  def set_calibration(self, points):
+    """ Sets the calibration from a list of (angle, timing) pairs (at least
+        two, in degrees and us), e.g. measured at several angles to correct
+        for non-linearities of the servo; in between, the timing is linearly
+        interpolated. The angular range is not changed. The points are kept
+        until `None` is passed, which restores the two-point calibration
+        from the timing and angular range.
+    """
+    if points is None:
+      self._calPoints = None
+      r = self._range
+      self._compile([(r[3], r[0]), (r[4], r[1])])
+      return
+    assert len(points) >= 2, "At least two calibration points required"
+    self._calPoints = sorted(points)
+    self._compile(self._calPoints)
+
+  def _compile(self, points):
+    # Compile calibration into a table with the timing for each degree of the
+    # angular range (piece-wise linear between the calibration points), by
+    # input angle, i.e. with the sign already applied
+    pts = sorted(points)
+    r = self._range
+    n = r[5] +1
+    lut = array.array('h', [0]*n)
+    for i in range(n):
+      a = min(r[4], max(r[3], (r[3] +i) *self._sign))
+      j = 0
+      while j < len(pts) -2 and a > pts[j+1][0]:
+        j += 1
+      a0, t0 = pts[j]
+      a1, t1 = pts[j+1]
+      if a1 == a0:
+        lut[i] = int(t0)
+      else:
+        lut[i] = int(t0 +(t1 -t0) *(a -a0) //(a1 -a0))
+    self._lut = lut
 
   def change_behavior(self, speed, accel):
     self._speed = speed if speed >= 0 and speed <= 255 else self._speed
@@ -84,11 +132,23 @@ class ServoBase(object):
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   def angle_in_us(self, angle=None):
-    """ Return the angle as timing value
+    """ Return the angle as timing value (from the calibration table; only
+        fractions of degrees are interpolated)
     """
     r = self._range
-    if not angle is None:
-      self._angle = min(r[4], max(r[3], angle)) *self._sign
-    return int(r[0] +r[2] *(self._angle -r[3]) //r[5])
+    if angle is None:
+      angle = self._angle *self._sign
+    if isinstance(angle, int):
+      i = min(r[4], max(r[3], angle)) -r[3]
+      self._angle = (r[3] +i) *self._sign
+      return self._lut[i]
+    a = min(r[4], max(r[3], angle))
+    self._angle = a *self._sign
+    a -= r[3]
+    i = int(a)
+    lut = self._lut
+    if i >= r[5]:
+      return lut[r[5]]
+    return int(lut[i] +(lut[i+1] -lut[i]) *(a -i))
 
 # ----------------------------------------------------------------------------
@@ -16,25 +16,74 @@
 # 2022-06-26, v1.8, Added option not to use `ulab`
 # 2022-08-10, v1.8, Added `trajectory` as property
 # 2022-08-10, v1.9, Added more trajectory types
+# 2026-10-17, v1.10, Cached, precomputed trajectory profile tables
+# 2026-10-17, v1.11, Allocation-free fixed-point interpolation in `_cb()`
+# 2026-10-17, v1.12, Bulk output via a servo cluster (one load per tick)
+# 2026-10-17, v1.13, Keyframe queue w/ seamless transitions and blending
+# 2026-10-17, v1.14, Optional wall-clock-based interpolation, late ticks
+# 2026-10-17, v1.15, Configurable and self-tuning tick period
+# 2026-10-17, v1.16, Minimum-jerk and spline trajectories (w/ velocity
+#                    continuity between queued keyframes)
+# 2026-10-17, v1.17, Skip writes that would not change the servo timing
+# 2026-10-17, v1.18, Timing statistics (`stats`)
+# 2026-10-17, v1.19, Vectorized interpolation w/ `ulab` (if available)
+# 2026-10-17, v1.20, Preempted moves start from the current position
+# 2026-10-18, v1.21, Live time scale (`time_scale`) for ongoing moves
+# 2026-10-18, v1.22, Trajectory type per servo, user-defined profiles
+# 2026-10-18, v1.23, Independent motion groups (`add_group()`)
+# 2026-10-18, v1.24, Scheduled callback at the end of segments
+# 2026-10-18, v1.25, Optional hard-interrupt timer, overrun/re-entry count
+# 2026-10-18, v1.26, Optional update loop on the second core (rp2)
 # ----------------------------------------------------------------------------
 import gc
 import time
 import array
+import micropython
+from time import ticks_us, ticks_diff, ticks_add, sleep_us
 from machine import Timer
 from robotling_lib.misc.helpers import timed_function
 from robotling_lib.platform.platform import platform as pf
+from robotling_lib.motors.trajectory import ProfileCache, is_valid
+from robotling_lib.motors.trajectory import PROFILE_SHIFT, PROFILE_ONE
+from robotling_lib.motors.trajectory import SPLINE_H10, SPLINE_H11
 import robotling_lib.misc.ansi_color as ansi
 try:
   from ulab import numpy as np
   ULAB = True
 except ImportError:
-  import math as np
   ULAB = False
+try:
+  import _thread
+except ImportError:
+  _thread = None
 
 # pylint: disable=bad-whitespace
-__version__        = "0.1.9.0"
+__version__        = "0.1.26.0"
 RATE_MS            = const(15)  # 5=hangs, 15...20=ok, 25=not continues
+MIN_RATE_MS        = const(10)  # range for auto-tuned tick period
+MAX_RATE_MS        = const(25)
+CPU_BUDGET_PERC    = const(30)  # auto-tuning: max. CPU share of the ticks
+AUTO_RATE_MIN_N    = const(20)  # auto-tuning: min. # of ticks measured
 HARDWARE_TIMER     = const(0)
+QUEUE_SIZE         = const(4)   # default max. number of queued keyframes
+LATE_TICK_PERC     = const(150) # tick is late if period exceeds this [%]
+MOVE_STATS_N       = const(8)   # # of moves kept in the statistics
+TIME_SCALE_SHIFT   = const(8)   # time scale is fixed-point Q8 ...
+TIME_SCALE_ONE     = const(256) # ... with this value representing 1
+MAX_TIME_SCALE     = const(4)   # (keeps scaled tick periods in int range)
+
+# Indices into the timing statistics array
+ST_CB_MIN          = const(0)   # callback duration [us] ...
+ST_CB_MAX          = const(1)
+ST_CB_SUM          = const(2)
+ST_CB_N            = const(3)   # .. # of callbacks
+ST_DT_MIN          = const(4)   # period between ticks [us] ...
+ST_DT_MAX          = const(5)
+ST_LATE            = const(6)   # # of late ticks
+ST_N_MOVES         = const(7)   # # of moves recorded
+ST_OVERRUN         = const(8)   # # of callbacks longer than the period
+ST_REENTRY         = const(9)   # # of callbacks started while one was running
+ST_COUNT           = const(10)
 # pylint: enable=bad-whitespace
 
 # ----------------------------------------------------------------------------
@@ -50,32 +99,193 @@ class ServoManager(object):
   TRJ_SINE        = const(2)
   TRJ_RAMP_UP     = const(3)
   TRJ_RAMP_DOWN   = const(4)
+  TRJ_MIN_JERK    = const(5)
+  TRJ_SPLINE      = const(6)
   # pylint: enable=bad-whitespace
 
-  def __init__(self, n, verbose=False):
-    """ Initialises the management structures
+  def __init__(self, n, verbose=False, lock_heap=False,
+               queue_size=QUEUE_SIZE, rate_ms=RATE_MS, use_ulab=True,
+               parent=None, hard_irq=False, core1=False):
+    """ Initialises the management structures. Positions are kept as integer
+        timing values and the trajectory profiles in fixed-point, so that the
+        timer callback does not allocate any memory; if `lock_heap` is True,
+        the heap is locked during the callback to enforce this (any
+        allocation then raises a `MemoryError`, e.g. for debugging).
+        Up to `queue_size` keyframes can be queued (see `queue()`).
+        `rate_ms` is the period of the timer that updates the servos; if 0,
+        the period is auto-tuned (see `auto_rate`).
+        If `use_ulab` is True and `ulab` is available, the positions of all
+        servos are computed as one vector expression per tick; as this
+        allocates memory, it is not used if `lock_heap`, `hard_irq` or
+        `core1` is True.
+        If `parent` is given, this manager is a motion group of the parent
+        (see `add_group()`) and has no timer of its own.
+        If `hard_irq` is True, the timer callback runs as hard interrupt
+        (where supported, e.g. rp2), hence it is not delayed by the garbage
+        collector or other activities of the main program; switching to the
+        next segment is then done in a scheduled (soft) callback. In this
+        mode, `wall_clock` is always on, as otherwise the time the switch
+        takes would be added to each segment.
+        If `core1` is True, no timer is used; instead, the servos are updated
+        in a deadline-driven loop that runs on the second core (requires
+        `_thread`, e.g. rp2). The main program then only queues keyframes,
+        which the loop takes from the queue (no locking needed, see
+        `queue()`). As the second core is paused while the garbage collector
+        runs, the loop does not allocate any memory.
     """
     self._isVerbose = verbose
+    self._isHeapLocked = lock_heap
     self._nChan = max(1, n)
     self._Servos = [None]*n                               # Servo objects
     self._servo_type = bytearray([TYPE_NONE]*n)           # Servo type
     self._servo_number = bytearray([255]*n)               # Servo number
-    self._servoPos = array.array("f", [0]*n)              # Servo pos [us]
+    self._servoPos = array.array("H", [0]*n)              # Servo pos [us]
     self._SIDList = bytearray([255]*n)                    # Servos to move next
     self._targetPosList = array.array("H", [0]*n)         # Target pos [us]
-    self._currPosList = array.array("f", [-1]*n)          # Current pos [us]
-    self._stepSizeList = array.array("f", [0]*n)          # .. step sizes [us]
+    self._startPosList = array.array("i", [0]*n)          # Start pos [us]
+    self._deltaList = array.array("i", [0]*n)             # .. distance [us]
     self._nToMove = 0                                     # # of servos to move
     self._dt_ms = 0                                       # Time period [ms]
     self._nSteps = 0                                      # countdown of steps to move
-    self._trajNormList = array.array("f", [0]*n)          # Sensor norm factor (TRJ_SINE)
+    self._Profiles = ProfileCache()                       # Trajectory tables
+    self._profile = None                                  # .. of current move (Q16)
+    self._profList = [None]*n                             # .. by servo in move
+    self._trjList = bytearray(n)                          # Trajectory types
     self._iStep = 0                                       # Current step
     self._nStTotal = 0                                    # total # of steps
+    self._rate_ms = rate_ms if rate_ms > 0 else RATE_MS   # Tick period [ms]
+    self._stepUs = self._rate_ms *1000                    # step duration [us]
+    self._t0 = 0                                          # segment start [us]
+    self._tLastTick = 0                                   # last tick [us]
+    self._tSegStart = 0                                   # real start [us]
+    self._isSegDone = True
+
+    # Time scale: moves progress in virtual time, which runs `time_scale`
+    # times as fast as real time
+    self._tScale = TIME_SCALE_ONE                         # Q8
+    self._tVirt = 0                                       # virtual time [us]
+    self._tRef = 0                                        # .. updated at [us]
+    self._stepFrac = 0                                    # fraction of step
+
+    # Segment-end event (see `set_callback()`)
+    self._evFunc = None                                   # function to call
+    self._evUs = 0                                        # .. [us] before end
+    self._isEvSent = True
+    self._nEvLost = 0                                     # # of lost events
+
+    # Timing statistics, incl. commanded and real duration [ms] of the last
+    # `MOVE_STATS_N` moves (see `stats`)
+    self._stats = array.array("i", [0]*ST_COUNT)
+    self._moveStats = array.array("i", [0]*MOVE_STATS_N*2)
+    self.reset_stats()
+    self._isWallClock = False
+
+    # Auto-tuning of the tick period, based on the measured callback duration
+    self._isAutoRate = rate_ms <= 0
+    self._cbSumUs = 0                                     # Sum of durations
+    self._cbN = 0                                         # .. # of ticks
+    self._nOverruns = 0                                   # # of overruns
+    self._tuneN = 0                                       # # of servos and ..
+    self._tuneTrj = 0                                     # .. trajectory type
+    self._inMove = bytearray(n)                           # Servo in move?
+    self._lastUsList = array.array("H", [0]*n)            # Last written [us]
+    self._nWrites = 0                                     # # of writes and ..
+    self._nSkipped = 0                                    # .. skipped writes
+
+    # Keyframe queue (ring buffer; only `queue()` changes the tail and only
+    # the timer callback changes the head, hence no locking is needed)
+    k = max(1, queue_size)
+    self._qSize = k
+    self._qHead = 0
+    self._qTail = 0
+    self._qSIDList = bytearray(k*n)                       # Servos to move
+    self._qTargetList = array.array("H", [0]*k*n)         # Target pos [us]
+    self._qNServos = bytearray(k)                         # # of servos
+    self._qNSteps = array.array("H", [0]*k)               # # of steps
+    self._qStepUs = array.array("i", [0]*k)               # step duration [us]
+    self._qProfile = [None]*k                             # Trajectory tables
+                                                          # .. (None=mixed)
+    self._qProfList = [None]*k*n                          # .. by servo
+    self._qTrjList = bytearray(k*n)                       # Trajectory types
+    self._qBasis0 = [None]*k                              # .. spline tangents
+    self._qBasis1 = [None]*k
+
+    # Blending: remainder of the previous segment ("tail"), superimposed on
+    # the current segment
+    self._blendMs = 0
+    self._blendSteps = 0
+    self._tailDeltaList = array.array("i", [0]*n)         # by servo [us]
+    self._tailProfile = None
+    self._tailStep = 0                                    # 1st step of tail
+    self._tailLen = 0                                     # 0=no tail
+
+    # Spline segments: tangents at start and end of the current segment, and
+    # the start tangent for the next segment (by servo), all in [us]
+    self._basis0 = None                                   # Hermite basis ..
+    self._basis1 = None                                   # .. tables (Q16)
+    self._m0List = array.array("i", [0]*n)
+    self._m1List = array.array("i", [0]*n)
+    self._m0NextList = array.array("i", [0]*n)            # by servo
+    self._nextPosList = array.array("i", [-1]*n)          # by servo
+
+    # Vectorized interpolation: start position, distance, tangents and tail
+    # of all servos (by servo) as `ulab` arrays
+    self._useUlab = (ULAB and use_ulab and not lock_heap and not hard_irq
+                     and not core1)
+    if self._useUlab:
+      self._ulStart = np.zeros(n)
+      self._ulDelta = np.zeros(n)
+      self._ulM0 = np.zeros(n)
+      self._ulM1 = np.zeros(n)
+      self._ulTail = np.zeros(n)
     self._mm18 = None
+    self._Cluster = None                                  # Bulk output, if any
     self._isMoving = False
     self._isFirstMove = True
     self._traject = TRJ_LINEAR
-    self._Timer = Timer() if pf.isRP2 else Timer(HARDWARE_TIMER)
+
+    # Motion groups: managers for other servos that move independently but
+    # are updated by the timer of their parent
+    self._Parent = parent
+    self._Groups = []
+
+    # Hard-interrupt mode: segment switches are handed over to a scheduled
+    # callback (bound method is created here, to not allocate in the timer
+    # callback)
+    self._isHardIRQ = hard_irq and not core1
+    self._isPending = False                               # switch scheduled
+    self._isHeld = False                                  # queue is changed
+    self._isInCb = False
+    self._cbNextSeg = self._soft_next_segment
+    self._isWallClock = self._isHardIRQ
+
+    # Update loop on the second core, instead of the timer
+    self._isCore1 = core1 and parent is None
+    if self._isCore1 and _thread is None:
+      raise RuntimeError("No `_thread` to run the loop on core 1")
+    self._isLoopRunning = False
+    self._isLoopDone = True
+    if parent is None and not self._isCore1:
+      self._Timer = Timer() if pf.isRP2 else Timer(HARDWARE_TIMER)
+    else:
+      self._Timer = None
+      self._isAutoRate = False
+
+  def add_group(self, n, queue_size=QUEUE_SIZE, use_ulab=True):
+    """ Returns a new motion group for `n` (other) servos, e.g. for a sensor
+        that scans while the legs walk; the group is a servo manager with
+        its own moves, queue, trajectory type, time scale etc., but it is
+        updated in the same timer tick (and with the same tick period) as
+        this manager
+    """
+    assert self._Parent is None, "Groups cannot be nested"
+    grp = ServoManager(
+        n, verbose=self._isVerbose, lock_heap=self._isHeapLocked,
+        queue_size=queue_size, rate_ms=self._rate_ms, use_ulab=use_ulab,
+        parent=self, hard_irq=self._isHardIRQ
+      )
+    self._Groups.append(grp)
+    return grp
 
   def add_servo(self, i, servoObj, pos=0):
     """ Add at the entry `i` of the servo list the servo object, which has to
@@ -84,6 +294,9 @@ class ServoManager(object):
         - `angle_in_us(value=None)`
         - `off()`
         - `deinit()`
+        If the servo object has a `cluster` attribute (see `ServoCluster`),
+        it also needs to define `stage_us(t_us)`; during moves, the positions
+        of all servos are then staged and committed with one `load()` per tick
     """
     if i in range(self._nChan):
       self._Servos[i] = servoObj
@@ -96,6 +309,12 @@ class ServoManager(object):
         self._mm18 = servoObj._mm18
       except AttributeError:
         pass
+      try:
+        assert self._Cluster in [None, servoObj.cluster], \
+          "All servos need to share the same cluster"
+        self._Cluster = servoObj.cluster
+      except AttributeError:
+        pass
 
   def set_servo_type(self, i, type):
     """ Change servo type (see `TYPE_xxx`)
@@ -112,11 +331,14 @@ class ServoManager(object):
         if self._Servos[i] is not None:
           t = self._Servos[i].angle_in_us(_pos[i])
           self._servoPos[i] = t
-          self._currPosList[i] = t
+          self._lastUsList[i] = 0
+      self._retire_segment()
 
   def turn_all_off(self, deinit=False):
     """ Turn all servos off
     """
+    for i in range(self._nChan):
+      self._lastUsList[i] = 0
     for servo in self._Servos:
       if not servo is None:
         servo.off()
@@ -124,9 +346,18 @@ class ServoManager(object):
           servo.deinit()
 
   def deinit(self):
-    """ Clean up
+    """ Clean up (incl. motion groups)
     """
-    self._Timer.deinit()
+    self._isMoving = False
+    if self._isCore1:
+      self._isLoopRunning = False
+      while not self._isLoopDone:
+        sleep_us(100)
+    elif self._Parent is None:
+      self._Timer.deinit()
+    if self._Parent is None:
+      for grp in self._Groups:
+        grp.deinit()
     self.turn_all_off(deinit=True)
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -135,147 +366,752 @@ class ServoManager(object):
     self.move(servos, pos, dt_ms, lin_vel)
 
   #@micropython.native
-  def move(self, servos, pos, dt_ms=0):
+  def move(self, servos, pos, dt_ms=0, trj=None):
     """ Move the servos in the list to the positions given in `pos`.
         If `dt_ms` > 0, then it will be attempted that all servos reach the
-        position at the same time (that is after `dt_ms` ms)
+        position at the same time (that is after `dt_ms` ms), using the
+        trajectory type `trj` (or `trajectory`, if None); `trj` can also be
+        a list with a trajectory type for each servo. An ongoing move is
+        stopped and all queued keyframes are discarded; the new move starts
+        from the position the servos have reached (with the next tick).
     """
-    # Stop ongoing move
+    # Stop ongoing move and discard queue
+    wasMoving = self._isMoving
     self._isMoving = False
+    self._isPending = False
+    self._wait_for_update()
+    self._qHead = self._qTail
+    self._clear_tail()
+    self._clear_tangents()
+    self._nWrites = 0
+    self._nSkipped = 0
+
+    if dt_ms <= 0:
+      # Just move them w/o considering timing
+      ser = self._Servos
+      spo = self._servoPos
+      for iSr, SID in enumerate(servos):
+        if ser[SID]:
+          t = ser[SID].angle_in_us(pos[iSr])
+          spo[SID] = t
+          ser[SID].write_us(t)
+          self._lastUsList[SID] = t
+          self._nWrites += 1
+      self._retire_segment()
+      return
+
+    # Setup timer to keep moving them in the requested time
+    self._enqueue(servos, pos, dt_ms, trj)
+    self._next_segment(False, preempt=wasMoving)
+    self._start_clock()
+    self._start()
+
+  def queue(self, servos, pos, dt_ms, trj=None):
+    """ Append a keyframe (as in `move()`) to the queue; it is started by the
+        timer callback as soon as the previous segment has ended, without a
+        stop in between (or, with `blend_ms` > 0, already slightly earlier).
+        Starts moving if idle. Returns False if the queue is full.
+        The positions are converted into timing values right away, hence
+        `pos` can be reused (e.g. by the gait) after the call.
+    """
+    if dt_ms <= 0 or self.queue_free == 0:
+      return False
+    self._enqueue(servos, pos, dt_ms, trj)
+    if not self._isMoving:
+      self._wait_for_update()
+      self._clear_tail()
+      self._clear_tangents()
+      self._nWrites = 0
+      self._nSkipped = 0
+      self._next_segment(False)
+      self._start_clock()
+      self._start()
+    elif self._basis0 is not None:
+      # If the keyframe directly follows the current (spline) segment, the
+      # end tangent of that segment was not yet known
+      self._hold(True)
+      try:
+        if self.queued == 1 and self._isMoving:
+          self._set_end_tangents(self._qHead)
+          if self._useUlab:
+            self._ul_load()
+      finally:
+        self._hold(False)
+    return True
+
+  def set_callback(self, func=None, before_ms=0):
+    """ Set a function that is scheduled (see `micropython.schedule()`)
+        `before_ms` ms before each segment ends (0=when its target is
+        reached), with the number of keyframes still queued as parameter,
+        that is 0 for the last segment of a move; e.g. to queue the next
+        keyframe instead of polling `is_moving`. `func` should be a function
+        or a bound method that is kept somewhere, so that it is not newly
+        created in the timer callback. If None, no callback is made
+    """
+    self._evFunc = func
+    self._evUs = max(0, int(before_ms)) *1000
+
+  def clear_queue(self):
+    """ Discard all queued keyframes (does not stop the current segment) and
+        return their number; with spline trajectories, the current segment
+        then ends with zero velocity
+    """
+    self._hold(True)
+    try:
+      n = (self._qTail -self._qHead) % (2*self._qSize)
+      self._qHead = self._qTail
+      if self._isMoving:
+        self._set_end_tangents(self._qHead)
+        if self._useUlab:
+          self._ul_load()
+    finally:
+      self._hold(False)
+    return n
+
+  def _hold(self, state):
+    # Keep the timer callback (or the update loop) from switching to the
+    # next segment while the queue or the current segment is changed (see
+    # `_update()`)
+    self._isHeld = state
+    if state:
+      self._wait_for_update()
+
+  def _start_clock(self):
+    t = ticks_us()
+    self._t0 = t
+    self._tSegStart = t
+    self._tVirt = t
+    self._tRef = t
+    self._stepFrac = 0
+
+  def _start(self):
+    if self._Parent is None:
+      self._start_timer()
+    elif self._isFirstMove:
+      self._tLastTick = ticks_us()
+      self._isFirstMove = False
+      self._Parent._start_timer()
+    self._isMoving = True
 
-    # Prepare new move
-    n = 0
-    trj = self._traject
-    '''
-    nSteps = dt_ms /RATE_MS
-    '''
-    nSteps = int(dt_ms /RATE_MS)
+  def _wait_for_update(self):
+    # If the update loop runs on the other core, wait until the current
+    # update is done (it does not touch the move after `_isMoving` was
+    # cleared)
+    if self._isCore1:
+      while self._isInCb:
+        sleep_us(10)
+
+  def _start_timer(self):
+    if self._isFirstMove:
+      self._tLastTick = ticks_us()
+      self._init_timer()
+      self._isFirstMove = False
+
+  def _init_timer(self):
+    if self._isCore1:
+      if not self._isLoopRunning:
+        self._isLoopRunning = True
+        self._isLoopDone = False
+        _thread.start_new_thread(self._loop, ())
+    elif self._isHardIRQ:
+      self._Timer.init(
+          period=self._rate_ms, mode=Timer.PERIODIC, callback=self._cb,
+          hard=True
+        )
+    else:
+      self._Timer.init(
+          period=self._rate_ms, mode=Timer.PERIODIC, callback=self._cb
+        )
+
+  def _enqueue(self, servos, pos, dt_ms, trj):
+    """ Convert positions into timing values, look up the profile table and
+        store the keyframe in the next free queue slot
+    """
+    n = self._nChan
+    k = self._qSize
+    iq = self._qTail % k
+    ofs = iq *n
+    trj = self._traject if trj is None else trj
+    isMixed = not isinstance(trj, int)
+    if self._isAutoRate:
+      self._tune_rate(len(servos), max(trj) if isMixed else trj)
+    nSteps = max(1, int(dt_ms) //self._rate_ms)
     ser = self._Servos
-    sdl = self._SIDList
-    tpl = self._targetPosList
-    spo = self._servoPos
-    ssl = self._stepSizeList
-    cpl = self._currPosList
-    tnl = self._trajNormList
+    qsd = self._qSIDList
+    qtp = self._qTargetList
+    qpl = self._qProfList
+    qtr = self._qTrjList
+    prc = self._Profiles
+    isSpl = False
+    m = 0
     for iSr, SID in enumerate(servos):
       if not ser[SID]:
         continue
-      sdl[n] = SID
-      tpl[n] = ser[SID].angle_in_us(pos[iSr])
-      if nSteps > 0:
-        # A time period is given, therefore calculate the step sizes for this
-        # servo's move, with ...
-        p = spo[SID]
-        if trj > TRJ_LINEAR:
-          ssl[n] = tpl[n] -p  # whole step
-          cpl[n] = p          # current position
-          lim = nSteps/np.pi
-          ofs = 0
-          if ULAB:
-            # ULAB version
-            if trj == TRJ_SINE:
-              pass
-            elif trj == TRJ_RAMP_UP or trj == TRJ_RAMP_DOWN:
-              assert False, "ULAB versions of `TRJ_RAMP_xxx` not implemented"
-            _a = np.array(
-                [np.sin((i+1)/lim +ofs) for i in range(nSteps-1)]
-              )
-            tnl[n] = np.sum(_a)
-          else:
-            # Standard math version
-            if trj == TRJ_SINE:
-              pass
-            elif trj == TRJ_RAMP_UP:
-              lim = nSteps/(np.pi/2)
-            elif trj == TRJ_RAMP_DOWN:
-              lim = nSteps/(np.pi/2)
-              ofs = np.pi/2
-            _a = array.array(
-                "f", [np.sin((i+1)/lim +ofs) for i in range(nSteps-1)]
-              )
-            tnl[n] = 0
-            for j in range(len(_a)):
-              tnl[n] += _a[j]
-
-        else:
-          # Linear move (each step has the same size)
-          s = (tpl[n] -p) /nSteps
-          cpl[n] = int(p +s)
-          ssl[n] = s
+      t = trj[iSr] if isMixed else trj
+      qsd[ofs +m] = SID
+      a = pos[iSr]
+      if isinstance(a, int):
+        # Whole degrees: look up timing in the servo's calibration table
+        # directly (inlined `angle_in_us()`)
+        srv = ser[SID]
+        r = srv._range
+        a = min(r[4], max(r[3], a))
+        srv._angle = a *srv._sign
+        qtp[ofs +m] = srv._lut[a -r[3]]
       else:
-        # Move directly, therefore update already the final position
-        spo[SID] = tpl[iSr]
-      n += 1
-    self._iStep = 0
-    self._nToMove = n
-    self._dt_ms = dt_ms
-    '''
-    self._nSteps = int(nSteps)
-    '''
-    self._nSteps = nSteps
+        qtp[ofs +m] = ser[SID].angle_in_us(a)
+      qpl[ofs +m] = prc.get(t, nSteps)
+      qtr[ofs +m] = t
+      isSpl = isSpl or t == TRJ_SPLINE
+      m += 1
+    if isMixed:
+      # Use common profile if all servos have the same trajectory type
+      isMixed = False
+      for j in range(1, m):
+        isMixed = isMixed or qtr[ofs +j] != qtr[ofs]
+    self._qNServos[iq] = m
+    self._qNSteps[iq] = nSteps
+    self._qStepUs[iq] = int(dt_ms) *1000 //nSteps
+    self._qProfile[iq] = None if isMixed or m == 0 else qpl[ofs]
+    if isSpl:
+      self._qBasis0[iq] = self._Profiles.get(SPLINE_H10, nSteps)
+      self._qBasis1[iq] = self._Profiles.get(SPLINE_H11, nSteps)
+    else:
+      self._qBasis0[iq] = None
+      self._qBasis1[iq] = None
+    self._qTail = (self._qTail +1) % (2*k)
+
+  def _tune_rate(self, n, trj):
+    """ Re-evaluate the tick period if the number of servos to move (`n`) or
+        the trajectory type (`trj`) changed. The new period is the shortest
+        one for which the callback (scaled by the number of servos) stays
+        within `CPU_BUDGET_PERC`; if the callback overran the period, the
+        period is made longer in any case
+    """
+    if n == self._tuneN and trj == self._tuneTrj:
+      return
+    if self._isMoving and not self._isWallClock:
+      # Changing the period would change the timing of the queued keyframes
+      return
+    if self._cbN >= AUTO_RATE_MIN_N:
+      us = self._cbSumUs //self._cbN *n //max(1, self._tuneN)
+      r = (us *100 //CPU_BUDGET_PERC +999) //1000
+      if self._nOverruns > 0:
+        r = max(r, self._rate_ms +1)
+      self._set_rate(min(max(r, MIN_RATE_MS), MAX_RATE_MS))
+      if self._isVerbose:
+        print("Tick: {0} us for {1} servo(s), {2} overrun(s) -> {3} ms"
+              .format(us, n, self._nOverruns, self._rate_ms))
+    elif self._tuneN > 0:
+      # Not enough data yet to judge the last combination
+      return
+    self._cbSumUs = 0
+    self._cbN = 0
+    self._nOverruns = 0
+    self._tuneN = n
+    self._tuneTrj = trj
+
+  def _set_rate(self, rate_ms):
+    if self._Parent is not None:
+      # (motion groups are updated with the tick period of their parent)
+      self._Parent._set_rate(rate_ms)
+      return
+    if rate_ms != self._rate_ms:
+      self._rate_ms = rate_ms
+      self._blendSteps = self._blendMs //rate_ms
+      for grp in self._Groups:
+        grp._rate_ms = rate_ms
+        grp._blendSteps = grp._blendMs //rate_ms
+      if not self._isFirstMove:
+        self._init_timer()
+
+  def _clear_tail(self):
+    tdl = self._tailDeltaList
+    for i in range(self._nChan):
+      tdl[i] = 0
+    self._tailLen = 0
+
+  def _clear_tangents(self):
+    m0n = self._m0NextList
+    for i in range(self._nChan):
+      m0n[i] = 0
+
+  def _retire_segment(self):
+    # Forget the current segment, e.g. after the servo positions were set
+    # directly, so that its targets are not taken as new start positions
+    inm = self._inMove
+    sdl = self._SIDList
+    for i in range(self._nToMove):
+      inm[sdl[i]] = 0
+    self._nToMove = 0
+    self._isSegDone = True
+
+  @micropython.native
+  def _next_segment(self, blend, nSt=0, preempt=False):
+    """ Make the next queued keyframe the current segment. If `blend` is
+        True, the current segment is not yet finished (`nSt` steps left) and
+        its remaining movement is kept as tail. The start time of the new
+        segment follows from that of the current one, so that no time is
+        lost at the transition. If `preempt` is True, the current segment
+        was interrupted and the new segment starts from the last written
+        positions. Does not allocate memory.
+    """
+    n = self._nChan
+    k = self._qSize
+    iq = self._qHead % k
+    ofs = iq *n
+    sdl = self._SIDList
+    tpl = self._targetPosList
+    stl = self._startPosList
+    dll = self._deltaList
+    spo = self._servoPos
+    tdl = self._tailDeltaList
+    inm = self._inMove
+    qsd = self._qSIDList
+    qtp = self._qTargetList
+    prl = self._profList
+    trl = self._trjList
+    qpl = self._qProfList
+    qtr = self._qTrjList
+
+    # Retire current segment, unless already done (see `_retire_segment()`);
+    # the servo positions are set to the targets, as the next segment starts
+    # from there (or, if the current segment was interrupted, to where the
+    # servos actually are)
+    lul = self._lastUsList
+    m = self._nToMove
+    for i in range(m):
+      SID = sdl[i]
+      if not preempt:
+        spo[SID] = tpl[i]
+      elif lul[SID] > 0:
+        spo[SID] = lul[SID]
+      inm[SID] = 0
+      if blend:
+        tdl[SID] = dll[i]
+    if blend and m > 0:
+      self._tailProfile = self._profile
+      self._tailStep = self._nStTotal -nSt
+      self._tailLen = self._nStTotal
+    self._t0 = ticks_add(self._t0, (self._nStTotal -nSt) *self._stepUs)
+
+    # Setup new segment
+    m = self._qNServos[iq]
+    for j in range(m):
+      SID = qsd[ofs +j]
+      p = spo[SID]
+      sdl[j] = SID
+      tpl[j] = qtp[ofs +j]
+      stl[j] = p
+      dll[j] = qtp[ofs +j] -p
+      prl[j] = qpl[ofs +j]
+      trl[j] = qtr[ofs +j]
+      inm[SID] = 1
+    if blend:
+      # Keep servos that are only part of the tail in the list
+      for SID in range(n):
+        if tdl[SID] != 0 and not inm[SID]:
+          sdl[m] = SID
+          tpl[m] = spo[SID]
+          stl[m] = spo[SID]
+          dll[m] = 0
+          prl[m] = self._qProfile[iq]
+          trl[m] = 0
+          inm[SID] = 1
+          m += 1
+    self._nToMove = m
+    self._profile = self._qProfile[iq]
+    self._basis0 = self._qBasis0[iq]
+    self._basis1 = self._qBasis1[iq]
+    self._nSteps = self._qNSteps[iq]
     self._nStTotal = self._nSteps
+    self._stepUs = self._qStepUs[iq]
+    self._iStep = 0
+    self._isSegDone = False
+    self._isEvSent = False
+    self._set_tangents()
+    if self._useUlab:
+      self._ul_load()
+    self._qHead = (self._qHead +1) % (2*k)
 
-    # Initiate move
-    if dt_ms == 0:
-      # Just move them w/o considering timing
-      for iSr in range(n):
-        ser[sdl[iSr]].write_us(tpl[iSr])
-    else:
-      # Setup timer to keep moving them in the requested time
-      if self._isFirstMove:
-        self._Timer.init(period=RATE_MS, mode=Timer.PERIODIC, callback=self._cb)
-        self._isFirstMove = False
-      self._isMoving = True
+  @micropython.native
+  def _set_tangents(self):
+    """ Determine the tangents of the (new) current segment, if it is a
+        spline segment: the start tangent is the one at the end of the
+        previous segment, the end tangent follows from the next keyframe, if
+        already queued (see `_set_end_tangents()`). Does not allocate memory.
+    """
+    sdl = self._SIDList
+    m0l = self._m0List
+    m1l = self._m1List
+    m0n = self._m0NextList
+    trl = self._trjList
+    isSpl = self._basis0 is not None
+    for j in range(self._nToMove):
+      SID = sdl[j]
+      m0l[j] = m0n[SID] if isSpl and trl[j] == TRJ_SPLINE else 0
+      m1l[j] = 0
+    self._set_end_tangents((self._qHead +1) % (2*self._qSize))
+
+  @micropython.native
+  def _set_end_tangents(self, iq):
+    """ Determine the end tangents of the current segment, if it is a spline
+        segment, and the start tangents of the next segment from the keyframe
+        at queue position `iq`, if it is queued (Catmull-Rom); otherwise, the
+        tangents are zero. Tangents are set to zero where a servo reverses
+        direction and limited to avoid overshooting, like for a monotone
+        cubic interpolation. If the segment is already under way, the rest of
+        it is adjusted such that the servos do not jump. Does not allocate
+        memory.
+    """
+    n = self._nChan
+    m = self._nToMove
+    k = self._qSize
+    sdl = self._SIDList
+    tpl = self._targetPosList
+    stl = self._startPosList
+    dll = self._deltaList
+    prl = self._profList
+    m1l = self._m1List
+    m0n = self._m0NextList
+    npl = self._nextPosList
+    trl = self._trjList
+    for SID in range(n):
+      m0n[SID] = 0
+      npl[SID] = -1
+    if self._basis0 is None:
+      return
+
+    # Targets of the next keyframe, if it is queued and also a spline
+    ta = self._nStTotal *self._stepUs //1000
+    tb = 0
+    if iq != self._qTail and self._qBasis0[iq % k] is not None:
+      iq = iq % k
+      ofs = iq *n
+      qsd = self._qSIDList
+      qtp = self._qTargetList
+      qtr = self._qTrjList
+      for j in range(self._qNServos[iq]):
+        if qtr[ofs +j] == TRJ_SPLINE:
+          npl[qsd[ofs +j]] = qtp[ofs +j]
+      tb = self._qNSteps[iq] *self._qStepUs[iq] //1000
+
+    # Velocity at the transition from the current to the next keyframe,
+    # as tangent of the current (`m1`) and the next segment (`m0`)
+    bs1 = self._basis1
+    iSt = min(self._iStep, self._nStTotal -1)
+    for j in range(m):
+      SID = sdl[j]
+      if trl[j] != TRJ_SPLINE:
+        continue
+      m0 = 0
+      m1 = 0
+      d1 = dll[j]
+      d2 = npl[SID] -tpl[j]
+      if npl[SID] >= 0 and ((d1 > 0 and d2 > 0) or (d1 < 0 and d2 < 0)):
+        v = d1 +d2
+        m1 = ta *v //(ta +tb)
+        m0 = tb *v //(ta +tb)
+        if abs(m1) > 3*abs(d1):
+          m0 = m0 *3*d1 //m1
+          m1 = 3*d1
+        if abs(m0) > 3*abs(d2):
+          m1 = m1 *3*d2 //m0
+          m0 = 3*d2
+      c = PROFILE_ONE -prl[j][iSt]
+      if iSt > 0 and m1 != m1l[j] and c > 0:
+        # Segment is under way: shift start and distance such that the
+        # position of the next step and the target stay the same
+        e = (m1 -m1l[j]) *bs1[iSt] //c
+        stl[j] -= e
+        dll[j] += e
+      m1l[j] = m1
+      m0n[SID] = m0
+
+  def _ul_load(self):
+    """ Copy the current segment into the `ulab` arrays
+    """
+    sdl = self._SIDList
+    ust = self._ulStart
+    udl = self._ulDelta
+    um0 = self._ulM0
+    um1 = self._ulM1
+    utl = self._ulTail
+    tdl = self._tailDeltaList
+    for SID in range(self._nChan):
+      udl[SID] = 0
+      utl[SID] = tdl[SID]
+    for j in range(self._nToMove):
+      SID = sdl[j]
+      ust[SID] = self._startPosList[j]
+      udl[SID] = self._deltaList[j]
+      um0[SID] = self._m0List[j]
+      um1[SID] = self._m1List[j]
+
+  def _ul_positions(self, iSt, tSt):
+    """ Returns the positions of all servos for step `iSt` of the current
+        segment (and step `tSt` of the tail, if any) as `ulab` array
+    """
+    pos = self._ulStart +self._ulDelta *(self._profile[iSt] /PROFILE_ONE)
+    if self._basis0 is not None:
+      pos += self._ulM0 *(self._basis0[iSt] /PROFILE_ONE)
+      pos += self._ulM1 *(self._basis1[iSt] /PROFILE_ONE)
+    if self._tailLen > 0:
+      pos -= self._ulTail *(1 -self._tailProfile[tSt] /PROFILE_ONE)
+    return pos
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   #@timed_function
-  @micropython.native
   def _cb(self, value):
+    t = ticks_us()
+    if self._isInCb:
+      # Previous callback has not yet returned
+      self._stats[ST_REENTRY] += 1
+      return
+    self._isInCb = True
+    if self._isHeapLocked:
+      micropython.heap_lock()
+    try:
+      isMoving = self._isMoving
+      self._update()
+      grs = self._Groups
+      for i in range(len(grs)):
+        isMoving = isMoving or grs[i]._isMoving
+        grs[i]._update()
+    finally:
+      if self._isHeapLocked:
+        micropython.heap_unlock()
+      self._isInCb = False
+    if isMoving:
+      # Measure the duration of the callback, for the statistics and for
+      # auto-tuning the period
+      d = ticks_diff(ticks_us(), t)
+      sta = self._stats
+      sta[ST_CB_MIN] = min(sta[ST_CB_MIN], d)
+      sta[ST_CB_MAX] = max(sta[ST_CB_MAX], d)
+      if sta[ST_CB_SUM] > 0x1FFFFFFF:
+        # Keep sum in small integer range (keeps the mean)
+        sta[ST_CB_SUM] >>= 1
+        sta[ST_CB_N] >>= 1
+      sta[ST_CB_SUM] += d
+      sta[ST_CB_N] += 1
+      isOver = d > self._rate_ms *1000
+      if isOver:
+        sta[ST_OVERRUN] += 1
+      if self._isAutoRate:
+        self._cbSumUs += d
+        self._cbN += 1
+        if isOver:
+          self._nOverruns += 1
+
+  def _loop(self):
+    # Update loop on the second core; each update is started at its deadline
+    # (every `rate_ms`), if the deadline was missed, the loop resynchronizes
+    tNext = ticks_us()
+    try:
+      while self._isLoopRunning:
+        tNext = ticks_add(tNext, self._rate_ms *1000)
+        self._cb(None)
+        dt = ticks_diff(tNext, ticks_us())
+        if dt > 0:
+          sleep_us(dt)
+        else:
+          tNext = ticks_us()
+    finally:
+      self._isLoopDone = True
+
+  def _soft_next_segment(self, nSt):
+    # Scheduled by the (hard-interrupt) timer callback to switch to the next
+    # segment; `nSt` > 0 means blending with `nSt` steps left
+    if self._isPending and not self._isHeld and self._qHead != self._qTail:
+      self._next_segment(nSt > 0, nSt)
+    self._isPending = False
+
+  @micropython.native
+  def _hand_off(self, nSt):
+    # Schedule switching to the next segment (see `_soft_next_segment()`)
+    self._isPending = True
+    try:
+      micropython.schedule(self._cbNextSeg, nSt)
+    except:
+      # Schedule queue is full, try again with the next tick
+      self._isPending = False
+
+  @micropython.native
+  def _update(self):
+    """ Advance the ongoing move by one step; only uses integer arithmetic on
+        preallocated arrays, hence it does not allocate memory
+    """
+    tNow = ticks_us()
+    dt = ticks_diff(tNow, self._tLastTick)
+    self._tLastTick = tNow
+
     if self._isMoving:
-      # Update every servo in the list
+      # Keep track of the period between ticks and of late ticks
+      sta = self._stats
+      sta[ST_DT_MIN] = min(sta[ST_DT_MIN], dt)
+      sta[ST_DT_MAX] = max(sta[ST_DT_MAX], dt)
+      if dt > self._rate_ms *10 *LATE_TICK_PERC:
+        sta[ST_LATE] += 1
+
+      # Advance the virtual time by the (scaled) time passed
+      ts = self._tScale
+      tv = ticks_add(
+          self._tVirt, (ticks_diff(tNow, self._tRef) *ts) >> TIME_SCALE_SHIFT
+        )
+      self._tVirt = tv
+      self._tRef = tNow
+      if self._isPending or self._isHeld:
+        # Waiting for the switch to the next segment (or until the queue
+        # has been changed)
+        return
+
+      # Determine number of steps left; in wall-clock mode, this is derived
+      # from the (virtual) time passed since the segment started, otherwise
+      # the steps are counted down by tick (by `time_scale` steps per tick,
+      # with the fraction carried over to the next tick)
       nSt = self._nSteps
+      if self._isWallClock:
+        nSt = self._steps_left(tv)
+      elif ts != TIME_SCALE_ONE:
+        f = self._stepFrac +ts
+        nSt = min(max(nSt +1 -(f >> TIME_SCALE_SHIFT), 0), self._nStTotal)
+        self._stepFrac = f & (TIME_SCALE_ONE -1)
+
+      # Continue with next keyframe, if the current segment has ended (or, if
+      # blending, is about to end)
+      if self._qHead != self._qTail:
+        while nSt == 0 and self._qHead != self._qTail:
+          if not self._isSegDone:
+            self._record_move(tNow)
+          if self._isHardIRQ:
+            self._hand_off(0)
+            return
+          self._next_segment(False)
+          nSt = self._steps_left(tv) if self._isWallClock else self._nSteps
+        iq = self._qHead % self._qSize
+        if (self._qHead != self._qTail and nSt <= self._blendSteps
+            and self._tailLen == 0 and self._qNSteps[iq] >= nSt
+            and self._basis0 is None and self._qBasis0[iq] is None
+            and self._profile is not None
+            and self._qProfile[iq] is not None):
+          self._record_move(tNow)
+          if self._isHardIRQ:
+            self._hand_off(nSt)
+            return
+          self._next_segment(True, nSt)
+          nSt = self._nSteps
+
+      # Signal that the segment ends (soon), if requested
+      if (not self._isEvSent and self._evFunc is not None
+          and (nSt -1) *self._stepUs <= self._evUs):
+        self._isEvSent = True
+        try:
+          micropython.schedule(
+              self._evFunc, (self._qTail -self._qHead) % (2*self._qSize)
+            )
+        except:
+          # Schedule queue is full
+          self._nEvLost += 1
+
+      # Update every servo in the list
       sdl = self._SIDList
-      cpl = self._currPosList
-      ssl = self._stepSizeList
+      stl = self._startPosList
+      dll = self._deltaList
       tpl = self._targetPosList
       spo = self._servoPos
       ser = self._Servos
+      tdl = self._tailDeltaList
       iSr = self._nToMove -1
-      iSt = self._iStep
-      nST = self._nStTotal
-      tnl = self._trajNormList
-      trj = self._traject
+      iSt = self._nStTotal -nSt
+      prl = self._profList
+      bs0 = self._basis0
+      bs1 = self._basis1
+      m0l = self._m0List
+      m1l = self._m1List
+      lul = self._lastUsList
+      nWr = 0
+      clu = self._Cluster
+      tlL = self._tailLen
+      tpr = self._tailProfile
+      tSt = min(self._tailStep +iSt, tlL -1)
+      ulp = None
+      if self._useUlab and nSt > 0 and self._profile is not None:
+        # Compute all positions at once (if all have the same profile)
+        ulp = self._ul_positions(iSt, tSt)
       while iSr >= 0:
-        if not spo[sdl[iSr]] == tpl[iSr]:
-          if nSt > 0:
+        SID = sdl[iSr]
+        if not spo[SID] == tpl[iSr] or tdl[SID] != 0:
+          if ulp is not None:
+            t = int(ulp[SID])
+          elif nSt > 0:
             # Move is ongoing, update servo position ...
-            if trj > TRJ_LINEAR:
-              if trj == TRJ_SINE:
-                lim = np.pi
-                ofs = 0
-              elif trj == TRJ_RAMP_UP:
-                lim = np.pi/2
-                ofs = 0
-              elif trj == TRJ_RAMP_DOWN:
-                lim = np.pi/2
-                ofs = np.pi/2
-              cpl[iSr] += ssl[iSr] *np.sin((iSt+1)/nST *lim +ofs) /tnl[iSr]
-              ser[sdl[iSr]].write_us(cpl[iSr])
+            prf = prl[iSr]
+            if bs0 is None:
+              t = stl[iSr] +((dll[iSr] *prf[iSt]) >> PROFILE_SHIFT)
             else:
-              ser[sdl[iSr]].write_us(cpl[iSr])
-              cpl[iSr] += ssl[iSr]
+              # (spline, i.e. with the tangents at start and end)
+              t = stl[iSr] +((dll[iSr] *prf[iSt] +m0l[iSr] *bs0[iSt]
+                              +m1l[iSr] *bs1[iSt]) >> PROFILE_SHIFT)
+            if tlL > 0:
+              # ... and subtract what is left of the previous segment
+              t -= (tdl[SID] *(PROFILE_ONE -tpr[tSt])) >> PROFILE_SHIFT
           else:
             # Move has ended, therefore set servo to the target position
-            spo[sdl[iSr]] = tpl[iSr]
-            ser[sdl[iSr]].write_us(spo[sdl[iSr]])
+            spo[SID] = tpl[iSr]
+            t = tpl[iSr]
+          if t == lul[SID]:
+            # Timing would not change, hence skip writing
+            iSr -= 1
+            continue
+          if clu is None:
+            ser[SID].write_us(t)
+          else:
+            ser[SID].stage_us(t)
+          lul[SID] = t
+          nWr += 1
         iSr -= 1
+      if clu is not None and nWr > 0:
+        # Output new positions of all servos in the same frame
+        clu.load()
+      self._nWrites += nWr
+      self._nSkipped += self._nToMove -nWr
+      if nSt <= 1 and not self._isSegDone:
+        # Target of segment reached
+        self._record_move(tNow)
+      if tlL > 0 and tSt >= tlL -1:
+        # Previous segment is completely done
+        self._clear_tail()
       if nSt > 0:
         self._nSteps = nSt -1
-        self._iStep += 1
+        self._iStep = iSt +1
       else:
         # Move is done
         self._isMoving = False
 
+  @micropython.native
+  def _record_move(self, t):
+    """ Add commanded and real duration of the current segment, which ended at
+        time `t`, to the statistics; the next segment starts at `t`
+    """
+    sta = self._stats
+    mst = self._moveStats
+    i = (sta[ST_N_MOVES] % MOVE_STATS_N) *2
+    mst[i] = self._nStTotal *self._stepUs //1000
+    mst[i+1] = ticks_diff(t, self._tSegStart) //1000
+    sta[ST_N_MOVES] += 1
+    self._tSegStart = t
+    self._isSegDone = True
+
+  @micropython.native
+  def _steps_left(self, t):
+    """ Returns the number of steps of the current segment left at (virtual)
+        time `t` (including the step due now), with 0 meaning the segment has
+        ended
+    """
+    i = max(1, ticks_diff(t, self._t0) //self._stepUs)
+    return max(0, self._nStTotal -i +1)
+
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
   @property
   def is_moving(self):
@@ -283,12 +1119,156 @@ class ServoManager(object):
     """
     return self._isMoving
 
+  @property
+  def remaining_ms(self):
+    """ Returns the time (in ms) left until the current segment ends (not
+        including queued keyframes), not scaled by `time_scale`
+    """
+    if not self._isMoving:
+      return 0
+    if self._isWallClock:
+      dt = ticks_diff(self._tVirt, self._t0)
+      return max(0, self._nStTotal *self._stepUs -dt) //1000
+    return self._nSteps *self._stepUs //1000
+
+  @property
+  def queued(self):
+    """ Returns the number of keyframes waiting in the queue
+    """
+    return (self._qTail -self._qHead) % (2*self._qSize)
+
+  @property
+  def queue_free(self):
+    """ Returns the number of keyframes that can still be queued
+    """
+    return self._qSize -self.queued
+
+  @property
+  def write_counts(self):
+    """ Returns the number of servo writes issued and skipped (because the
+        timing did not change) since the current move was started
+    """
+    return self._nWrites, self._nSkipped
+
+  @property
+  def wall_clock(self):
+    """ Get/set wall-clock mode; if True, the trajectory position is derived
+        from the time passed since the start of the segment (instead of
+        counting ticks), such that moves end on time even if ticks are late;
+        always on in hard-interrupt mode
+    """
+    return self._isWallClock
+  @wall_clock.setter
+  def wall_clock(self, val):
+    self._isWallClock = bool(val) or self._isHardIRQ
+
+  @property
+  def time_scale(self):
+    """ Get/set the time scale (0 ... `MAX_TIME_SCALE`), by which all moves
+        are sped up (>1) or slowed down (<1); a change also affects the
+        ongoing move and the queued keyframes, starting with the next tick
+    """
+    return self._tScale /TIME_SCALE_ONE
+  @time_scale.setter
+  def time_scale(self, val):
+    ts = int(val *TIME_SCALE_ONE +0.5)
+    self._tScale = min(max(ts, 0), MAX_TIME_SCALE *TIME_SCALE_ONE)
+
+  @property
+  def late_ticks(self):
+    """ Returns the number of late timer ticks (period exceeded by more than
+        `LATE_TICK_PERC` %) since the last `reset_stats()`
+    """
+    return self._stats[ST_LATE]
+
+  @property
+  def stats(self):
+    """ Returns the timing statistics since the last `reset_stats()` as a
+        dictionary with:
+        - `cb_us`, duration of the timer callback as (min, mean, max) in [us]
+        - `period_us`, period between ticks as (min, max) in [us]
+        - `jitter_us`, maximal deviation of that period from `rate_ms`
+        - `late`, number of late ticks (see `late_ticks`)
+        - `moves`, commanded and real duration of the last moves in [ms], as
+          list of tuples (oldest first)
+        - `lost_events`, number of callbacks that could not be scheduled
+        - `overruns`, number of callbacks that took longer than `rate_ms`
+        - `reentries`, number of callbacks that were skipped because the
+          previous one was still running
+        Only ticks while moving are considered.
+    """
+    sta = self._stats
+    mst = self._moveStats
+    nCb = sta[ST_CB_N]
+    if nCb == 0:
+      cb = (0, 0, 0)
+      dt = (0, 0)
+      jit = 0
+    else:
+      cb = (sta[ST_CB_MIN], sta[ST_CB_SUM] //nCb, sta[ST_CB_MAX])
+      dt = (sta[ST_DT_MIN], sta[ST_DT_MAX])
+      per = self._rate_ms *1000
+      jit = max(abs(dt[0] -per), abs(dt[1] -per))
+    nMv = sta[ST_N_MOVES]
+    moves = []
+    for j in range(max(0, nMv -MOVE_STATS_N), nMv):
+      i = (j % MOVE_STATS_N) *2
+      moves.append((mst[i], mst[i+1]))
+    return {
+        "cb_us": cb, "period_us": dt, "jitter_us": jit,
+        "late": sta[ST_LATE], "moves": moves, "lost_events": self._nEvLost,
+        "overruns": sta[ST_OVERRUN], "reentries": sta[ST_REENTRY]
+      }
+
+  def reset_stats(self):
+    """ Reset timing statistics
+    """
+    sta = self._stats
+    for i in range(ST_COUNT):
+      sta[i] = 0
+    sta[ST_CB_MIN] = 0x3FFFFFFF
+    sta[ST_DT_MIN] = 0x3FFFFFFF
+
+  @property
+  def blend_ms(self):
+    """ Get/set the time (in ms) by which a queued keyframe is started before
+        the current segment ends; the movements overlap during this time,
+        hence the velocity changes smoothly at the transition (0=off)
+    """
+    return self._blendMs
+  @blend_ms.setter
+  def blend_ms(self, val):
+    self._blendMs = max(0, int(val))
+    self._blendSteps = self._blendMs //self._rate_ms
+
+  @property
+  def rate_ms(self):
+    """ Get/set the tick period (in ms); setting it disables auto-tuning
+    """
+    return self._rate_ms
+  @rate_ms.setter
+  def rate_ms(self, val):
+    self._isAutoRate = False
+    self._set_rate(max(1, int(val)))
+
+  @property
+  def auto_rate(self):
+    """ Get/set auto-tuning of the tick period; if on, the period is
+        re-evaluated whenever the number of servos to move or the trajectory
+        type changes
+    """
+    return self._isAutoRate
+  @auto_rate.setter
+  def auto_rate(self, val):
+    self._isAutoRate = bool(val)
+
   @property
   def trajectory(self):
     return self._traject
   @trajectory.setter
   def trajectory(self, traj):
-    if traj in [TRJ_SINE, TRJ_LINEAR, TRJ_RAMP_UP, TRJ_RAMP_DOWN]:
+    # (incl. types registered with `trajectory.register_profile()`)
+    if is_valid(traj):
       self._traject = traj
 
   # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
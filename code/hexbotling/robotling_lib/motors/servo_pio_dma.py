@@ -0,0 +1,251 @@
+# ----------------------------------------------------------------------------
+# servo_pio_dma.py
+# Servo pulse engine for the RP2040: PIO state machines generate the pulses
+# for up to 16 servos, fed by DMA from a position table in RAM
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1
+#
+# Each state machine serves up to 8 consecutive pins, one after the other in
+# slots of `SLOT_US`; 8 slots make up the 20 ms frame (50 Hz). For each slot,
+# the table holds two words: the pin mask (lower 8 bits) and the high time
+# (upper 24 bits), and the low time until the end of the slot. Two chained
+# DMA channels per state machine stream the table into the TX FIFO over and
+# over again (the 2nd channel only rewinds the 1st), hence changing a servo
+# position is just a write to the table, without CPU load for the pulses.
+# Only the servo pins are handed to the PIO and set as outputs; the other
+# GPIOs within the 8-pin blocks keep their function (e.g. UART).
+# ----------------------------------------------------------------------------
+import array
+import rp2
+from machine import Pin, mem32
+from uctypes import addressof
+from micropython import const
+import robotling_lib.misc.ansi_color as ansi
+from robotling_lib.misc.helpers import timed_function
+from robotling_lib.motors.servo_base import ServoBase
+
+# pylint: disable=bad-whitespace
+__version__        = "0.1.0.0"
+DEF_RANGE_DEG      = (0, 180)
+DEF_RANGE_US       = (500, 2500)
+
+SM_FREQ            = const(1_000_000)  # 1 cycle = 1 us
+SLOTS_PER_SM       = const(8)
+SLOT_US            = const(2500)       # 8 slots = 20 ms
+HIGH_OVERHEAD      = const(2)          # cycles added to high time ...
+SLOT_OVERHEAD      = const(8)          # ... and to the whole slot
+MIN_US             = const(100)
+MAX_US             = const(2400)
+
+PIO_BASE           = (0x50200000, 0x50300000)
+PIO_TXF0           = const(0x10)
+PIO_SM0_PINCTRL    = const(0xDC)
+PIO_SM_SIZE        = const(0x18)
+PINCTRL_OUT_COUNT  = const(20)         # bit position of OUT_COUNT
+DMA_BASE           = const(0x50000000)
+DMA_CH_SIZE        = const(0x40)
+DMA_READ_ADDR_TRIG = const(0x3C)       # AL3_READ_ADDR_TRIG
+DREQ_PIO_TX0       = (0, 8)
+# pylint: enable=bad-whitespace
+
+@rp2.asm_pio(out_shiftdir=rp2.PIO.SHIFT_RIGHT)
+def _servo_slots():
+  wrap_target()
+  pull(block)
+  out(pins, 8)            # Pin of this slot high (mask)
+  out(x, 24)              # High time
+  label('high')
+  jmp(x_dec, 'high')
+  mov(pins, null)         # All pins low
+  pull(block)
+  out(x, 32)              # Low time, until end of slot
+  label('low')
+  jmp(x_dec, 'low')
+  wrap()
+
+# ----------------------------------------------------------------------------
+class ServoPIODMA(object):
+  """Pulse engine for a number of servo pins, driven by PIO and DMA from a
+     position table; like `ServoCluster`, it hands out servo objects for its
+     channels that can be added to the `ServoManager`."""
+
+  def __init__(self, pins, pio=1, sm=0, verbose=False):
+    """ Initialises the engine for the list of `pins` (which have to be
+        within 16 consecutive GPIOs) using PIO `pio`, starting with state
+        machine `sm` (one state machine per 8 GPIOs). Only the GPIOs in
+        `pins` are driven (low, when idle); the others are not changed
+    """
+    self._verbose = verbose
+    self._pins = bytearray(pins)
+    self._pin0 = min(pins)
+    nSM = (max(pins) -self._pin0) //SLOTS_PER_SM +1
+    assert sm +nSM <= 4, "Not enough state machines for these pins"
+
+    # Position table, initially with all pins low
+    self._table = array.array("I", [0]*nSM*SLOTS_PER_SM*2)
+    for i in range(nSM*SLOTS_PER_SM):
+      self._set_slot(i, 0, 1500)
+    self._tabAddr = array.array("I", [0]*nSM)
+    self._SMs = []
+    self._DMAs = []
+    for i in range(nSM):
+      # State machine for the next 8 pins
+      p0 = self._pin0 +i*SLOTS_PER_SM
+      smi = rp2.StateMachine(
+          pio*4 +sm +i, _servo_slots, freq=SM_FREQ, out_base=Pin(p0)
+        )
+      # The program has no `out_init` (which would claim all 8 pins), hence
+      # the OUT pin count is set directly; then only the servo pins of this
+      # block are handed to the PIO and made outputs (low)
+      reg = PIO_BASE[pio] +PIO_SM0_PINCTRL +(sm +i) *PIO_SM_SIZE
+      mem32[reg] = (mem32[reg] & ~(0x3F << PINCTRL_OUT_COUNT)) \
+                   | (SLOTS_PER_SM << PINCTRL_OUT_COUNT)
+      mask = 0
+      for p in pins:
+        if p0 <= p < p0 +SLOTS_PER_SM:
+          Pin(p, Pin.OUT, value=0)
+          Pin(p, Pin.ALT, alt=(Pin.ALT_PIO0, Pin.ALT_PIO1)[pio])
+          mask |= 1 << (p -p0)
+      smi.put(mask)
+      smi.exec("pull()")
+      smi.exec("out(pindirs, 8)")
+      # DMA channel that streams this state machine's part of the table, and
+      # a channel that then resets the read address (which restarts the 1st)
+      ofs = i *SLOTS_PER_SM *2 *4
+      self._tabAddr[i] = addressof(self._table) +ofs
+      dma = rp2.DMA()
+      ctl = rp2.DMA()
+      dma.config(
+          read=self._tabAddr[i], write=PIO_BASE[pio] +PIO_TXF0 +(sm+i)*4,
+          count=SLOTS_PER_SM *2,
+          ctrl=dma.pack_ctrl(
+              size=2, inc_write=False, treq_sel=DREQ_PIO_TX0[pio] +sm +i,
+              chain_to=ctl.channel
+            )
+        )
+      ctl.config(
+          read=addressof(self._tabAddr) +i*4,
+          write=DMA_BASE +dma.channel *DMA_CH_SIZE +DMA_READ_ADDR_TRIG,
+          count=1,
+          ctrl=ctl.pack_ctrl(size=2, inc_read=False, inc_write=False)
+        )
+      smi.active(1)
+      dma.active(1)
+      self._SMs.append(smi)
+      self._DMAs.append((dma, ctl))
+    if verbose:
+      print("Servo PIO/DMA engine for {0} pins ({1} state machine(s)) ready."
+            .format(len(pins), nSM))
+
+  def servo(self, chan, us_range=DEF_RANGE_US, ang_range=DEF_RANGE_DEG,
+            us_limits=DEF_RANGE_US, verbose=False):
+    """ Returns a servo object for channel `chan` (index into `pins`) that
+        can be added to the `ServoManager` like a single servo
+    """
+    return PIODMAServo(self, chan, us_range, ang_range, us_limits, verbose)
+
+  @property
+  def count(self):
+    return len(self._pins)
+
+  def load(self):
+    """ Nothing to do, as the DMA reads the positions directly from the
+        table (for compatibility with `ServoCluster`)
+    """
+    pass
+
+  @micropython.native
+  def pulse(self, chan, t_us, load=True):
+    """ Set the pulse width (in us) of channel `chan`
+    """
+    t = min(max(int(t_us), MIN_US), MAX_US)
+    self._set_slot(self._pins[chan] -self._pin0, 1, t)
+
+  def disable(self, chan):
+    self._set_slot(self._pins[chan] -self._pin0, 0, 1500)
+
+  def deinit(self):
+    """ Stop DMA and state machines, all pins low
+    """
+    for dma, ctl in self._DMAs:
+      ctl.close()
+      dma.close()
+    for smi in self._SMs:
+      smi.active(0)
+    for i in range(self.count):
+      Pin(self._pins[i], Pin.OUT, value=0)
+
+  @micropython.native
+  def _set_slot(self, i, on, t_us):
+    # Update the two table words of slot `i`; the DMA may read them between
+    # the two writes, which changes the length of this slot in one frame
+    tab = self._table
+    j = i *2
+    tab[j] = ((1 << (i % SLOTS_PER_SM)) if on else 0) \
+             | ((t_us -HIGH_OVERHEAD) << 8)
+    tab[j+1] = SLOT_US -SLOT_OVERHEAD -t_us +HIGH_OVERHEAD
+
+# ----------------------------------------------------------------------------
+class PIODMAServo(ServoBase):
+  """Single channel of a `ServoPIODMA` engine, with the same interface as
+     the other servo classes."""
+
+  def __init__(self, engine, chan, us_range=DEF_RANGE_US,
+               ang_range=DEF_RANGE_DEG, us_limits=DEF_RANGE_US,
+               verbose=False):
+    """ Initialises channel `chan` of the engine `engine`, with the timing
+        (`us_range`) for the given angular range (`ang_range`), and the
+        timing limits (`us_limits`).
+    """
+    super().__init__(50, us_range, ang_range, us_limits, verbose)
+    # (`cluster` lets the `ServoManager` use `stage_us()` and `load()`)
+    self.cluster = engine
+    self._chan = chan
+    if verbose:
+      print("Servo at engine channel {0} ready.".format(chan))
+
+  @property
+  def angle(self):
+    """ Report current angle (in degrees)
+    """
+    return self._angle
+
+  @angle.setter
+  def angle(self, value):
+    """ Move to the specified angle (in degrees)
+    """
+    self.write_us(self.angle_in_us(value))
+
+  def off(self):
+    """ Turn servo off
+    """
+    self.cluster.disable(self._chan)
+
+  def deinit(self):
+    """ Disable this channel
+    """
+    try:
+      self.cluster.disable(self._chan)
+    except:
+      pass
+
+  # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  @timed_function
+  def write_us_timed(self, t_us):
+    self.write_us(t_us)
+
+  def write_us(self, t_us):
+    """ Move to a position given by the timing (with the next frame)
+    """
+    self.cluster.pulse(self._chan, t_us)
+    if self._verbose:
+      print("chan={0}, t_us={1}".format(self._chan, t_us))
+
+  def stage_us(self, t_us):
+    """ Same as `write_us()`, the table is read continuously
+    """
+    self.cluster.pulse(self._chan, t_us)
+
+# ----------------------------------------------------------------------------
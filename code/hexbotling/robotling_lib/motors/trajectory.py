@@ -0,0 +1,177 @@
+# ----------------------------------------------------------------------------
+# trajectory.py
+# Precomputed, normalized trajectory profiles for the servo manager
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-17, v1
+# 2026-10-17, v1.1, Minimum-jerk and cubic (Hermite) spline profiles
+# 2026-10-18, v1.2, User-defined profiles (`register_profile()`)
+# ----------------------------------------------------------------------------
+import array
+import math
+try:
+  from micropython import const
+except ImportError:
+  # (also used by the host tool `hexbotling_gait_packer.py`)
+  const = lambda x: x
+
+# pylint: disable=bad-whitespace
+__version__        = "0.1.2.0"
+
+# Trajectory types (same values as `ServoManager.TRJ_xxx`)
+TRJ_LINEAR         = const(1)
+TRJ_SINE           = const(2)
+TRJ_RAMP_UP        = const(3)
+TRJ_RAMP_DOWN      = const(4)
+TRJ_MIN_JERK       = const(5)
+TRJ_SPLINE         = const(6)
+TRJ_USER           = const(16)  # first type for user-defined profiles
+
+# Cubic Hermite basis functions for the start and end tangents of a spline
+# segment (the position profile of `TRJ_SPLINE` is the third basis function)
+SPLINE_H10         = const(0x81)
+SPLINE_H11         = const(0x82)
+
+PROFILE_CACHE_SIZE = const(8)   # max. number of cached profile tables
+PROFILE_SHIFT      = const(16)  # profile entries are fixed-point Q16 ...
+PROFILE_ONE        = const(65536)  # ... with this value representing 1
+# pylint: enable=bad-whitespace
+
+# User-defined profile generators, by trajectory type, and the number of
+# registrations (tells the caches that their tables may be outdated)
+_generators = {}
+_nRegistered = 0
+
+# ----------------------------------------------------------------------------
+def register_profile(trj, func):
+  """ Register `func` as generator for trajectory type `trj` (with
+      `TRJ_USER` <= `trj` < `SPLINE_H10`); `func(u)` is called with the
+      normalized time 0 < u <= 1 and returns the fraction of the move that is
+      completed at that time (1 for u=1). A type can be registered again;
+      the profile caches then drop their tables (keyframes already queued
+      keep the previous profile)
+  """
+  global _nRegistered
+  if trj < TRJ_USER or trj >= SPLINE_H10:
+    raise ValueError("Trajectory type {0} not available".format(trj))
+  _generators[trj] = func
+  _nRegistered += 1
+
+def is_valid(trj):
+  """ Returns True if `trj` is a built-in or registered trajectory type
+  """
+  return TRJ_LINEAR <= trj <= TRJ_SPLINE or trj in _generators
+
+# ----------------------------------------------------------------------------
+def make_profile(trj, n):
+  """ Returns the normalized profile of trajectory type `trj` for a move of
+      `n` steps as an integer array; entry `i` is the fraction of the whole
+      move that is completed after step `i`, in Q16 fixed-point (that is,
+      scaled by `PROFILE_ONE`), hence the last entry is always `PROFILE_ONE`.
+      For `SPLINE_H10` and `SPLINE_H11`, the respective Hermite basis
+      function is returned instead (which is 0 at both ends)
+  """
+  n = max(1, n)
+  gen = _generators.get(trj)
+  if gen is not None:
+    prf = array.array("i", [0]*n)
+    for i in range(n):
+      v = gen((i+1)/n)
+      prf[i] = int(v *PROFILE_ONE +(0.5 if v >= 0 else -0.5))
+    prf[n-1] = PROFILE_ONE
+    return prf
+
+  if trj in [TRJ_MIN_JERK, TRJ_SPLINE, SPLINE_H10, SPLINE_H11]:
+    # Profiles that are given as a function of normalized time
+    prf = array.array("i", [0]*n)
+    for i in range(n):
+      u = (i+1)/n
+      if trj == TRJ_MIN_JERK:
+        v = u*u*u *(10 -15*u +6*u*u)
+      elif trj == TRJ_SPLINE:
+        v = u*u *(3 -2*u)
+      elif trj == SPLINE_H10:
+        v = u *(1 -u) *(1 -u)
+      else:
+        v = u*u *(u -1)
+      prf[i] = int(v *PROFILE_ONE +(0.5 if v >= 0 else -0.5))
+    if trj < SPLINE_H10:
+      prf[n-1] = PROFILE_ONE
+    return prf
+
+  tmp = array.array("f", [0]*n)
+  s = 0
+  if trj > TRJ_LINEAR:
+    # Step sizes follow a (partial) sine wave
+    lim = math.pi
+    ofs = 0
+    if trj == TRJ_RAMP_UP:
+      lim = math.pi/2
+    elif trj == TRJ_RAMP_DOWN:
+      lim = math.pi/2
+      ofs = math.pi/2
+    for i in range(n):
+      s += math.sin((i+1)/n *lim +ofs)
+      tmp[i] = s
+  if s > 0:
+    for i in range(n):
+      tmp[i] /= s
+  else:
+    # Linear move (each step has the same size); also used as fallback for
+    # very short moves where the sine profile collapses
+    for i in range(n):
+      tmp[i] = (i+1)/n
+  prf = array.array("i", [int(v *PROFILE_ONE +0.5) for v in tmp])
+  prf[n-1] = PROFILE_ONE
+  return prf
+
+# ----------------------------------------------------------------------------
+class ProfileCache(object):
+  """Small cache of trajectory profile tables, keyed by trajectory type and
+     number of steps; the least recently used table is evicted first."""
+
+  def __init__(self, size=PROFILE_CACHE_SIZE):
+    self._size = max(1, size)
+    self._keys = []
+    self._tables = {}
+    self._nHits = 0
+    self._nMisses = 0
+    self._nRegistered = _nRegistered
+
+  def get(self, trj, n):
+    """ Returns the profile table for trajectory type `trj` and `n` steps,
+        creating it if it is not yet in the cache
+    """
+    if self._nRegistered != _nRegistered:
+      # Profile(s) (re-)registered since the tables were created
+      self.clear()
+      self._nRegistered = _nRegistered
+    key = (trj << 16) | n
+    keys = self._keys
+    prf = self._tables.get(key)
+    if prf is not None:
+      self._nHits += 1
+      if keys[-1] != key:
+        keys.remove(key)
+        keys.append(key)
+      return prf
+    self._nMisses += 1
+    if len(keys) >= self._size:
+      del self._tables[keys.pop(0)]
+    prf = make_profile(trj, n)
+    self._tables[key] = prf
+    keys.append(key)
+    return prf
+
+  def clear(self):
+    """ Remove all tables from the cache
+    """
+    self._keys = []
+    self._tables = {}
+
+  @property
+  def hits_misses(self):
+    return self._nHits, self._nMisses
+
+# ----------------------------------------------------------------------------
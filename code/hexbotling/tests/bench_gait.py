@@ -0,0 +1,172 @@
+# ----------------------------------------------------------------------------
+# bench_gait.py
+#
+# Compares the precompiled tripod gait tables with the former implementation,
+# which computed the angles for each phase on the fly: the results have to be
+# the same, the new version should be faster and not allocate memory
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# ----------------------------------------------------------------------------
+import gc
+import array
+import time
+import hxbl_config as cfg
+from hxbl_tripod_gait2 import TripodGait
+
+N_CALLS        = 1000
+
+# ----------------------------------------------------------------------------
+class LegacyTripodGait(TripodGait):
+  """Tripod gait as before v1.3 (angles computed for each phase)"""
+
+  def get_next_servo_pos(self, stop=False, turn_dir=0, rev=False):
+    def _set_leg(legs, a_cox, a_fem, d_coxL=1, d_coxR=1):
+      for iL in legs:
+        pol = d_coxL if iL % 2 == 0 else d_coxR
+        out[cfg.SRV_COX[iL]] = int(a_cox) *cfg.SRV_COX_DIR[iL] *pol
+        out[cfg.SRV_FEM[iL]] = int(a_fem)
+
+    seq = self._seq
+    asw = self._aCoxaSwing_deg if seq == self.NORMAL else -self._aCoxaSwing_deg
+    ac0 = self._aCoxaCenter_deg
+    alf = self._aLgLift_deg
+    apl = self._aLgPreLift_deg
+    adn = self._aLgDown_deg
+    rat = self._phaseRatio
+    dtp = self._tPhase_ms
+    trj = self._traject
+    lift_from_neutral = False
+    dt_ms = dtp
+    out = array.array("h", [0]*cfg.SRV_COUNT)
+    ls0, ls1 = self._legSets
+
+    if stop:
+      _set_leg(ls0, ac0, adn)
+      _set_leg(ls1, ac0, adn)
+      self._isInSeq = False
+      self._phase = 0
+
+    else:
+      if not self._isInSeq:
+        self._isInSeq = True
+        lift_from_neutral = True
+      tlc = 1
+      trc = 1
+      if abs(turn_dir) > 0.001:
+        tlc = -1 if turn_dir > 0 else 1
+        trc = -1 if turn_dir < 0 else 1
+      phs = self._phase
+      if self._subtype == 0:
+        if phs == 0:
+          asw = 0 if lift_from_neutral else asw
+          _set_leg(ls0,  asw, alf, tlc, trc)
+          _set_leg(ls1, -asw, adn, tlc, trc)
+          dt_ms *= rat if not rev else (1-rat)
+        elif phs == 1:
+          _set_leg(ls0, -asw, alf, tlc, trc)
+          _set_leg(ls1,  asw, adn, tlc, trc)
+          dt_ms *= (1 -rat) if not rev else rat
+        elif phs == 2:
+          _set_leg(ls0, -asw, adn, tlc, trc)
+          _set_leg(ls1,  asw, alf, tlc, trc)
+          dt_ms *= rat if not rev else (1-rat)
+        elif phs == 3:
+          _set_leg(ls0,  asw, adn, tlc, trc)
+          _set_leg(ls1, -asw, alf, tlc, trc)
+          dt_ms *= (1 -rat) if not rev else rat
+      elif self._subtype == 1:
+        if phs == 0:
+          asw = 0 if lift_from_neutral else asw
+          _set_leg(ls0,  asw, apl, tlc, trc)
+          _set_leg(ls1, -asw, adn, tlc, trc)
+          dt_ms *= rat if not rev else (1-rat)
+        elif phs == 1:
+          _set_leg(ls0, -asw, alf, tlc, trc)
+          _set_leg(ls1,  asw, adn, tlc, trc)
+          dt_ms *= (1 -rat) if not rev else rat
+        elif phs == 2:
+          _set_leg(ls0, -asw, adn, tlc, trc)
+          _set_leg(ls1,  asw, adn, tlc, trc)
+          dt_ms *= rat if not rev else (1-rat)
+        elif phs == 3:
+          _set_leg(ls0, -asw, adn, tlc, trc)
+          _set_leg(ls1,  asw, apl, tlc, trc)
+          dt_ms *= rat if not rev else (1-rat)
+        elif phs == 4:
+          _set_leg(ls0,  asw, adn, tlc, trc)
+          _set_leg(ls1, -asw, alf, tlc, trc)
+          dt_ms *= (1 -rat) if not rev else rat
+        elif phs == 5:
+          _set_leg(ls0,  asw, adn, tlc, trc)
+          _set_leg(ls1, -asw, adn, tlc, trc)
+          dt_ms *= rat if not rev else (1-rat)
+
+      self._lastRev = rev
+      if not rev:
+        self._phase = phs +1 if phs < self._nPhase-1 else 0
+      else:
+        self._phase = phs -1 if phs > 0 else self._nPhase-1
+
+    return int(dt_ms), out, trj
+
+# ----------------------------------------------------------------------------
+def sequence(gait):
+  # Walks through a fixed sequence of straight, turning, reversed and
+  # stopping steps; returns the list of results
+  res = []
+  for i in range(40):
+    stop = i % 13 == 12
+    turn = [0, 0.5, -0.5, 0][(i //4) % 4]
+    rev = (i //10) % 2 == 1
+    dt, ang, trj = gait.get_next_servo_pos(stop=stop, turn_dir=turn, rev=rev)
+    res.append((dt, list(ang), trj))
+  return res
+
+def compare(gNew, gOld):
+  ok = True
+  for st in gNew._subtypes:
+    for sq in [gNew.NORMAL, gNew.REVERSE]:
+      for g in [gNew, gOld]:
+        g.subtype = st
+        g.sequence = sq
+        g.swing_angle = 17
+        g.leg_lift_angle = 25
+      same = sequence(gNew) == sequence(gOld)
+      print("{0} subtype={1} seq={2:2}".format("ok  " if same else "FAIL", st, sq))
+      ok &= same
+  return ok
+
+def mem_free():
+  # Free heap memory (in bytes), or None if not reported (not MicroPython)
+  try:
+    return gc.mem_free()
+  except AttributeError:
+    return None
+
+def bench(gait):
+  # Returns the time per call (in us) and the memory allocated in total
+  # (None, if unknown)
+  gait.reset()
+  gc.collect()
+  mem = mem_free()
+  t0 = time.ticks_us()
+  for i in range(N_CALLS):
+    gait.get_next_servo_pos(turn_dir=0.5 if i & 0x10 else 0)
+  dt = time.ticks_diff(time.ticks_us(), t0)
+  return dt /N_CALLS, None if mem is None else mem -mem_free()
+
+# ----------------------------------------------------------------------------
+if __name__ == "__main__":
+  _New = TripodGait()
+  _Old = LegacyTripodGait()
+  ok = compare(_New, _Old)
+
+  for name, g in [("tables", _New), ("legacy", _Old)]:
+    t_us, mem = bench(g)
+    print("{0}: {1:.1f} us/call, {2} bytes allocated for {3} calls"
+          .format(name, t_us, "?" if mem is None else mem, N_CALLS))
+  print("Done, all ok." if ok else "Done, with errors.")
+
+# ----------------------------------------------------------------------------
@@ -0,0 +1,74 @@
+# ----------------------------------------------------------------------------
+# test_gait_blob.py
+#
+# Checks data-driven gaits: the blobs of the tripod gaits (`gaits/tripod.gait`
+# and `gaits/tripod6.gait`, packed from `code/gaits/*.json`) have to result
+# in the same moves as the built-in `TripodGait` (subtypes 0 and 1), forward
+# and in reverse; also loads all other blobs in `gaits/`
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# ----------------------------------------------------------------------------
+import os
+from hxbl_gait_base import GaitBase
+from hxbl_tripod_gait2 import TripodGait
+
+GAIT_DIR       = "gaits"
+
+def check(cond, msg):
+  print(("ok   " if cond else "FAIL ") +msg)
+  return cond
+
+def sequence(gait, rev=False):
+  # Walks through a fixed sequence of straight and turning steps and a stop;
+  # returns the list of results
+  res = []
+  for i in range(20):
+    stop = i == 19
+    turn = [0, 0.5, -0.5, 0][(i //4) % 4]
+    dt, ang, trj = gait.get_next_servo_pos(stop=stop, turn_dir=turn, rev=rev)
+    res.append((dt, list(ang), trj))
+  return res
+
+def same_moves(gait, ref):
+  return (sequence(gait) == sequence(ref)
+          and sequence(gait, True) == sequence(ref, True))
+
+# ----------------------------------------------------------------------------
+if __name__ == "__main__":
+  ok = True
+  for fn, st, nP in [("tripod", 0, 4), ("tripod6", 1, 6)]:
+    _Ref = TripodGait()
+    _Ref.subtype = st
+    _Gait = GaitBase()
+    _Gait.load(GAIT_DIR +"/" +fn +".gait")
+    ok &= check(_Gait._nPhase == nP, "{0} blob has {1} phases".format(fn, nP))
+    ok &= check(same_moves(_Gait, _Ref),
+                "{0}: same moves as `TripodGait`, subtype {1}".format(fn, st))
+
+  # Parameter changes recompile the tables
+  _Ref.swing_angle = 15
+  _Gait.swing_angle = 15
+  _Ref.sequence = GaitBase.REVERSE
+  _Gait.sequence = GaitBase.REVERSE
+  ok &= check(same_moves(_Gait, _Ref), "same after changes")
+
+  # Corrupted blob is rejected
+  with open(GAIT_DIR +"/tripod.gait", "rb") as f:
+    data = bytearray(f.read())
+  data[-3] ^= 0x01
+  try:
+    GaitBase().load(bytes(data))
+    ok &= check(False, "corrupted blob rejected")
+  except ValueError:
+    ok &= check(True, "corrupted blob rejected")
+
+  for fn in os.listdir(GAIT_DIR):
+    g = GaitBase()
+    g.load(GAIT_DIR +"/" +fn)
+    dt, ang, trj = g.get_next_servo_pos()
+    ok &= check(dt > 0, "`{0}` loaded".format(fn))
+  print("Done, all ok." if ok else "Done, with errors.")
+
+# ----------------------------------------------------------------------------
@@ -8,6 +8,8 @@
 # 2022-03-21, v1.0
 # ----------------------------------------------------------------------------
 import time
+import _thread
+from machine import idle
 from micropython import const
 from robotling_lib.platform.rp2 import board_rp2 as board
 from robotling_lib.motors.servo import Servo
@@ -20,9 +22,21 @@ SRV_PIN        = bytearray([board.D2, board.D3])
 SRV_MIN_US     = const(700)
 SRV_MAX_US     = const(2300)
 
+# Held until the servo manager reports the end of the move
+_Done = _thread.allocate_lock()
+_Done.acquire()
+
+def _on_done(n_queued):
+  # Scheduled by the servo manager when the move has ended
+  if n_queued == 0 and _Done.locked():
+    _Done.release()
+
 def wait():
-  while _SM.is_moving:
-    time.sleep_ms(100)
+  # Block until `_on_done()` releases the lock; a blocking `acquire()` would
+  # also block the scheduler (and hence `_on_done()`), therefore the core
+  # just idles until the next interrupt between the attempts
+  while not _Done.acquire(0):
+    idle()
 
 # ----------------------------------------------------------------------------
 if __name__ == "__main__":
@@ -34,6 +48,7 @@ if __name__ == "__main__":
         ang_range=SRV_RANGE_DEG[j]
       )
     _SM.add_servo(SRV_ID[j], srv)
+  _SM.set_callback(_on_done)
 
   _SM.move([0,1], [0,0])
   time.sleep_ms(2000)
@@ -0,0 +1,73 @@
+# ----------------------------------------------------------------------------
+# test_leg_ik.py
+#
+# Checks the leg kinematics tables against the direct computation: the foot
+# positions of the looked-up angles have to be close to the targets; also
+# times the lookup
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# ----------------------------------------------------------------------------
+import math
+import time
+import hxbl_config as cfg
+from hxbl_leg_ik import LegIK
+
+A_DOWN_DEG     = 5
+MAX_ERR_MM     = 1.5
+N_CALLS        = 1000
+
+def foot(a_cox, a_fem):
+  # Foot position (along the stride, height above ground) for the joint
+  # angles (direct computation, see `hxbl_leg_ik.py`)
+  def _pos(a_fem):
+    b = math.radians(a_fem)
+    x = cfg.LEG_FEMUR_MM *math.cos(b) +cfg.LEG_TIBIA_MM *math.sin(b)
+    z = cfg.LEG_FEMUR_MM *math.sin(b) -cfg.LEG_TIBIA_MM *math.cos(b)
+    return cfg.LEG_COXA_MM +x, z
+  rho, z = _pos(a_fem)
+  return rho *math.sin(math.radians(a_cox)), z -_pos(A_DOWN_DEG)[1]
+
+# ----------------------------------------------------------------------------
+if __name__ == "__main__":
+  _IK = LegIK(
+      cfg.LEG_COXA_MM, cfg.LEG_FEMUR_MM, cfg.LEG_TIBIA_MM, A_DOWN_DEG
+    )
+  smax, hmax = _IK.range_mm
+  err = 0
+  for h in range(0, hmax +1, 5):
+    for s in range(-smax, smax +1, 3):
+      ac, af = _IK.angles(s, h)
+      sf, hf = foot(ac, af)
+      err = max(err, abs(sf -s), abs(hf -h))
+  ok = err < MAX_ERR_MM
+  print("{0} max. error {1:.2f} mm".format("ok  " if ok else "FAIL", err))
+  ac, af = _IK.angles(0, 0)
+  ok &= af == A_DOWN_DEG and ac == 0
+  print("{0} neutral position".format("ok  " if ac == 0 and af == A_DOWN_DEG else "FAIL"))
+  out = _IK.angles(0, 0)
+  same = _IK.angles(smax, hmax) is out and out[0] != ac
+  ok &= same
+  print("{0} same output array".format("ok  " if same else "FAIL"))
+
+  # Ranges shorter than a table step would give single-row tables
+  for s_max, h_max in [(40, 1), (0, 40), (1, 1)]:
+    try:
+      LegIK(cfg.LEG_COXA_MM, cfg.LEG_FEMUR_MM, cfg.LEG_TIBIA_MM, A_DOWN_DEG,
+            s_max, h_max, 2)
+      rej = False
+    except ValueError:
+      rej = True
+    ok &= rej
+    print("{0} s_max={1} h_max={2} rejected"
+          .format("ok  " if rej else "FAIL", s_max, h_max))
+
+  t0 = time.ticks_us()
+  for i in range(N_CALLS):
+    _IK.angles(i % smax, i % hmax)
+  dt = time.ticks_diff(time.ticks_us(), t0)
+  print("{0:.1f} us/call".format(dt /N_CALLS))
+  print("Done, all ok." if ok else "Done, with errors.")
+
+# ----------------------------------------------------------------------------
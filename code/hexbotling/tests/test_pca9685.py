@@ -0,0 +1,91 @@
+# ----------------------------------------------------------------------------
+# test_pca9685.py
+#
+# Checks the PCA9685 servo backend against a fake I2C bus (no hardware
+# needed): the servo manager has to write all changed channels of a tick in
+# one burst, with the correct register contents
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# ----------------------------------------------------------------------------
+import time
+from robotling_lib.motors.pca9685 import PCA9685
+from robotling_lib.motors.servo_manager import ServoManager
+
+SRV_ID         = bytearray([0,1,2])
+SRV_CHAN       = bytearray([0,1,3])
+SRV_RANGE_US   = (1000, 2000)
+SRV_RANGE_DEG  = (-45, 45)
+
+# ----------------------------------------------------------------------------
+class FakeI2C(object):
+  """Records the transactions and keeps the register contents of the device,
+     incl. register auto-increment"""
+
+  def __init__(self):
+    self.regs = bytearray(256)
+    self.n_writes = 0
+    self.n_bytes = 0
+
+  def writeto(self, addr, buf, stop=True):
+    self.writeto_mem(addr, buf[0], buf[1:])
+
+  def writeto_mem(self, addr, reg, buf):
+    for i, v in enumerate(buf):
+      self.regs[(reg +i) & 0xFF] = v
+    self.n_writes += 1
+    self.n_bytes = len(buf)
+
+  def off_ticks(self, chan):
+    i = 0x06 +chan*4
+    return self.regs[i+2] | (self.regs[i+3] << 8)
+
+def check(cond, msg):
+  print(("ok   " if cond else "FAIL ") +msg)
+  return cond
+
+def us_to_ticks(dev, t_us):
+  return t_us *4096 //dev._usPerFrame
+
+# ----------------------------------------------------------------------------
+if __name__ == "__main__":
+  _I2C = FakeI2C()
+  _Dev = PCA9685(_I2C, n_chan=4)
+  ok = check(_I2C.regs[0xFE] == 121, "prescale for 50 Hz")
+  ok &= check(_I2C.regs[0x00] & 0x20 != 0, "auto-increment enabled")
+
+  _SM = ServoManager(len(SRV_ID), verbose=True)
+  for j in range(len(SRV_ID)):
+    srv = _Dev.servo(SRV_CHAN[j], us_range=SRV_RANGE_US, ang_range=SRV_RANGE_DEG)
+    _SM.add_servo(SRV_ID[j], srv)
+
+  # Direct move: one transaction per servo
+  n = _I2C.n_writes
+  _SM.move(SRV_ID, [0, 0, 0])
+  ok &= check(_I2C.n_writes -n == len(SRV_ID), "one write per servo")
+  ok &= check(_I2C.off_ticks(3) == us_to_ticks(_Dev, 1500), "channel 3 at 1500 us")
+
+  # Timed move: one burst per tick
+  n = _I2C.n_writes
+  _SM.move(SRV_ID, [45, -45, 45], 300)
+  nTicks = 0
+  while _SM.is_moving:
+    time.sleep_ms(_SM.rate_ms)
+    nTicks += 1
+  ok &= check(_I2C.n_writes -n <= nTicks +1, "at most one burst per tick")
+  ok &= check(_I2C.off_ticks(0) == us_to_ticks(_Dev, 2000), "channel 0 at 2000 us")
+  ok &= check(_I2C.off_ticks(1) == us_to_ticks(_Dev, 1000), "channel 1 at 1000 us")
+  ok &= check(_I2C.off_ticks(2) == 0x1000, "unused channel 2 still off")
+
+  # Burst only covers the changed channels
+  _Dev.pulse(0, 1200, load=False)
+  _Dev.load()
+  ok &= check(_I2C.n_bytes == 4, "burst for channel 0 only")
+  ok &= check(_I2C.off_ticks(0) == us_to_ticks(_Dev, 1200), "channel 0 at 1200 us")
+
+  _SM.deinit()
+  ok &= check(_I2C.regs[0x06 +3] & 0x10 != 0, "channel 0 off after deinit")
+  print("Done, all ok." if ok else "Done, with errors.")
+
+# ----------------------------------------------------------------------------
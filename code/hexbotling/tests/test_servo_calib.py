@@ -0,0 +1,80 @@
+# ----------------------------------------------------------------------------
+# test_servo_calib.py
+#
+# Checks the calibration table of the servo base class (no servos needed):
+# with two points, it has to give the same timing as the formula used before
+# the table; with several points, it has to interpolate between them, and the
+# points have to be kept when the range is changed
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# ----------------------------------------------------------------------------
+from robotling_lib.motors.servo_base import ServoBase
+
+# ----------------------------------------------------------------------------
+class FakeServo(ServoBase):
+  """Servo w/o output"""
+
+  def __init__(self, us_range, ang_range):
+    super().__init__(50, us_range, ang_range, (500, 2500), False)
+
+  def write_us(self, t_us):
+    pass
+
+  def off(self):
+    pass
+
+  def deinit(self):
+    pass
+
+def old_us(r, angle):
+  # Timing as computed before the calibration table (v1.7)
+  a = min(r[4], max(r[3], angle))
+  return int(r[0] +r[2] *(a -r[3]) //r[5])
+
+def check(cond, msg):
+  print(("ok   " if cond else "FAIL ") +msg)
+  return cond
+
+# ----------------------------------------------------------------------------
+if __name__ == "__main__":
+  ok = True
+
+  # Two-point table vs. old formula, incl. angles out of range
+  for usr, angr in [((1000, 2000), (-45, 45)), ((500, 2500), (0, 180)),
+                    ((2300, 700), (-90, 90)), ((1020, 1980), (-60, 40))]:
+    srv = FakeServo(usr, angr)
+    r = srv._range
+    nErr = 0
+    for a in range(angr[0] -10, angr[1] +11):
+      nErr += srv.angle_in_us(a) != old_us(r, a)
+    ok &= check(nErr == 0, "{0}, {1}: whole degrees as before ({2} errors)"
+                .format(usr, angr, nErr))
+    nErr = 0
+    for a in range(angr[0] *4, angr[1] *4 +1):
+      nErr += abs(srv.angle_in_us(a /4) -old_us(r, a /4)) > 1
+    ok &= check(nErr == 0, "{0}, {1}: fractions within 1 us ({2} errors)"
+                .format(usr, angr, nErr))
+
+  # Several calibration points
+  srv = FakeServo((1000, 2000), (-90, 90))
+  pts = [(-90, 600), (0, 1500), (45, 1900), (90, 2400)]
+  srv.set_calibration(pts)
+  ok &= check(all(srv.angle_in_us(a) == t for a, t in pts),
+              "multi-point: timing at the points")
+  ok &= check(srv.angle_in_us(-45) == 1050 and srv.angle_in_us(30) == 1766,
+              "multi-point: linear between the points")
+  ok &= check(abs(srv.angle_in_us(22.5) -1700) <= 1,
+              "multi-point: fractions of degrees")
+  ok &= check(srv.angle_in_us(-120) == 600 and srv.angle_in_us(100) == 2400,
+              "multi-point: clipped to the angular range")
+
+  # Calibration points kept when the range changes, reset w/ `None`
+  srv.change_range((1000, 2000), (-90, 90))
+  ok &= check(srv.angle_in_us(45) == 1900, "points kept by `change_range()`")
+  srv.set_calibration(None)
+  ok &= check(srv.angle_in_us(45) == 1750, "two-point table restored")
+  print("Done, all ok." if ok else "Done, with errors.")
+
+# ----------------------------------------------------------------------------
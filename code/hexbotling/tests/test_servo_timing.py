@@ -0,0 +1,70 @@
+# ----------------------------------------------------------------------------
+# test_servo_timing.py
+#
+# Checks the timing of queued segments (no servos needed): consecutive
+# segments have to follow each other without a gap, in the default mode and
+# with the timer callback as hard interrupt (where the switch to the next
+# segment is done in a scheduled callback)
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1.0
+# ----------------------------------------------------------------------------
+import time
+from robotling_lib.motors.servo_base import ServoBase
+from robotling_lib.motors.servo_manager import ServoManager
+
+SEG_MS         = 150
+N_SEGS         = 4
+
+# ----------------------------------------------------------------------------
+class FakeServo(ServoBase):
+  """Servo that only counts the writes"""
+
+  def __init__(self):
+    super().__init__(50, (1000, 2000), (-45, 45), (500, 2500), False)
+    self.n_writes = 0
+
+  def write_us(self, t_us):
+    self.n_writes += 1
+
+  def off(self):
+    pass
+
+  def deinit(self):
+    pass
+
+def check(cond, msg):
+  print(("ok   " if cond else "FAIL ") +msg)
+  return cond
+
+def run(hard_irq):
+  # Queues `N_SEGS` segments and returns the total duration (in ms) and the
+  # commanded and real durations of the segments
+  sm = ServoManager(1, hard_irq=hard_irq)
+  sm.add_servo(0, FakeServo())
+  sm.trajectory = ServoManager.TRJ_LINEAR
+  t0 = time.ticks_ms()
+  for i in range(N_SEGS):
+    sm.queue([0], [30 if i % 2 == 0 else -30], SEG_MS)
+  while sm.is_moving:
+    time.sleep_ms(1)
+  dt = time.ticks_diff(time.ticks_ms(), t0)
+  moves = sm.stats["moves"]
+  sm.deinit()
+  return dt, moves, sm.rate_ms
+
+# ----------------------------------------------------------------------------
+if __name__ == "__main__":
+  ok = True
+  for hard in [False, True]:
+    dt, moves, rate = run(hard)
+    mode = "hard IRQ" if hard else "default"
+    print("{0}: {1} ms in total, segments {2}".format(mode, dt, moves))
+    ok &= check(dt <= N_SEGS *SEG_MS +2*rate,
+                "{0}: segments w/o gaps".format(mode))
+    ok &= check(all(real < cmd +rate for cmd, real in moves),
+                "{0}: each segment on time".format(mode))
+  print("Done, all ok." if ok else "Done, with errors.")
+
+# ----------------------------------------------------------------------------
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# hexbotling_gait_packer.py
+# Validates gait descriptions (JSON, see `gaits/`) and packs them into
+# gait blobs that the hexbotling loads at runtime (`GaitBase.load()`),
+# i.e. gaits can be added and tuned w/o changing the firmware
+#
+# Usage:
+#   python hexbotling_gait_packer.py gaits/tripod.json -o tripod.gait
+#   python hexbotling_gait_packer.py -d tripod.gait
+#
+# The MIT License (MIT)
+# Copyright (c) 2026 Thomas Euler
+# 2026-10-18, v1
+# ---------------------------------------------------------------------
+import json
+import sys
+from argparse import ArgumentParser
+import hexbotling.hxbl_gait_blob as gb
+import hexbotling.robotling_lib.motors.trajectory as tr
+
+# pylint: disable=bad-whitespace
+__version__        = "0.1.0.0"
+# Trajectory types by name (user-defined types, which have to be registered
+# on the robot, can be given as numbers)
+TRJ_TYPES          = {
+    "default": 0, "linear": tr.TRJ_LINEAR, "sine": tr.TRJ_SINE,
+    "ramp_up": tr.TRJ_RAMP_UP, "ramp_down": tr.TRJ_RAMP_DOWN,
+    "min_jerk": tr.TRJ_MIN_JERK, "spline": tr.TRJ_SPLINE
+  }
+DEF_PARAMS         = {
+    "swing_deg": 23, "max_swing_deg": 40, "lift_deg": 30, "down_deg": 5,
+    "phase_ms": 1000
+  }
+# pylint: enable=bad-whitespace
+
+# ---------------------------------------------------------------------
+def parseCmdLn():
+  parser = ArgumentParser()
+  parser.add_argument("file", type=str,
+                      help="gait description (.json) or blob (with -d)")
+  parser.add_argument("-o", "--out", type=str, default="",
+                      help="blob file (default: description name + .gait)")
+  parser.add_argument("-d", "--dump", action="store_true",
+                      help="check and print contents of a blob")
+  return parser.parse_args()
+
+# ---------------------------------------------------------------------
+def is_number(v):
+  return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+def validate(desc):
+  """ Checks the gait description `desc` (a `dict`) and returns it as
+      arguments for `gb.pack()`; raises `ValueError` with all problems
+      found
+  """
+  err = []
+  name = desc.get("name", "")
+  if (not isinstance(name, str) or not name
+      or len(name.encode()) > gb.MAX_NAME_LEN):
+    err.append("`name` missing or longer than {0} characters"
+               .format(gb.MAX_NAME_LEN))
+
+  # Parameters (angles in degrees, time in ms)
+  prm = []
+  for key, lim in [("swing_deg", 90), ("max_swing_deg", 90),
+                   ("lift_deg", 90), ("down_deg", 90),
+                   ("phase_ms", 10000)]:
+    v = desc.get(key, DEF_PARAMS[key])
+    if not isinstance(v, int) or isinstance(v, bool) or abs(v) > lim:
+      err.append("`{0}` must be an integer within +/-{1}".format(key, lim))
+      v = DEF_PARAMS[key]
+    prm.append(v)
+  if prm[4] <= 0:
+    err.append("`phase_ms` must be > 0")
+
+  # Leg groups, by leg names; each leg has to be in exactly one group
+  groups = []
+  used = 0
+  for iG, legs in enumerate(desc.get("groups", [])):
+    m = 0
+    for leg in legs:
+      if leg not in gb.LEG_NAMES:
+        err.append("group {0}: unknown leg `{1}`".format(iG, leg))
+        continue
+      b = 1 << gb.LEG_NAMES.index(leg)
+      if (m | used) & b:
+        err.append("group {0}: leg `{1}` is already used".format(iG, leg))
+      m |= b
+    groups.append(m)
+    used |= m
+  if used != gb.ALL_LEGS:
+    err.append("groups must contain all legs ({0})"
+               .format(", ".join(gb.LEG_NAMES)))
+
+  # Phases; if not given, the reverse duration of a phase is the forward
+  # duration of the next phase (moving from that phase's pose back)
+  phases = []
+  ph = desc.get("phases", [])
+  nG = len(groups)
+  if not 1 <= len(ph) <= gb.MAX_PHASES:
+    err.append("1..{0} phases required".format(gb.MAX_PHASES))
+  for iP, p in enumerate(ph):
+    fw = p.get("time", 1.0)
+    rv = p.get("time_rev", ph[(iP +1) % len(ph)].get("time", 1.0))
+    trj = p.get("trajectory", "default")
+    cox = p.get("coxa", [])
+    fem = p.get("femur", [])
+    for key, v in [("time", fw), ("time_rev", rv)]:
+      if not is_number(v) or not 0 < v <= 2.55:
+        err.append("phase {0}: `{1}` must be a number within 0..2.55"
+                   .format(iP, key))
+    if isinstance(trj, str) and trj in TRJ_TYPES:
+      trj = TRJ_TYPES[trj]
+    elif (not isinstance(trj, int) or isinstance(trj, bool)
+          or not (tr.is_valid(trj) or tr.TRJ_USER <= trj < tr.SPLINE_H10)):
+      err.append("phase {0}: unknown trajectory `{1}`".format(iP, trj))
+    for key, v in [("coxa", cox), ("femur", fem)]:
+      if not isinstance(v, list) or len(v) != nG:
+        err.append("phase {0}: `{1}` needs one value per group"
+                   .format(iP, key))
+      elif any(not is_number(x) or abs(x) > 1.27 for x in v):
+        err.append("phase {0}: `{1}` values must be numbers within +/-1.27"
+                   .format(iP, key))
+    if not err:
+      phases.append((
+          round(fw *100), round(rv *100), trj,
+          [round(x *100) for x in cox], [round(x *100) for x in fem]
+        ))
+  if err:
+    raise ValueError("\n".join(err))
+  return name, prm, groups, phases
+
+def dump(data):
+  name, prm, groups, phases = gb.unpack(data)
+  print("Gait `{0}`, {1} bytes".format(name, len(data)))
+  print("  swing={0}° (max. {1}°), lift={2}°, down={3}°, phase={4} ms"
+        .format(*prm))
+  for iG, m in enumerate(groups):
+    legs = [gb.LEG_NAMES[i] for i in gb.legs_in_group(m)]
+    print("  group {0}: {1}".format(iG, ", ".join(legs)))
+  for iP, (fw, rv, trj, cox, fem) in enumerate(phases):
+    print("  phase {0}: time={1}%/{2}% trj={3} coxa={4} femur={5}"
+          .format(iP, fw, rv, trj, list(cox), list(fem)))
+
+# ---------------------------------------------------------------------
+if __name__ == "__main__":
+  args = parseCmdLn()
+  try:
+    if args.dump:
+      with open(args.file, "rb") as f:
+        dump(f.read())
+    else:
+      with open(args.file, "r") as f:
+        desc = json.load(f)
+      data = gb.pack(*validate(desc))
+      fOut = args.out if args.out else args.file.rsplit(".", 1)[0] +".gait"
+      with open(fOut, "wb") as f:
+        f.write(data)
+      print("`{0}` packed into `{1}` ({2} bytes)"
+            .format(desc["name"], fOut, len(data)))
+  except ValueError as e:
+    print("Invalid gait:\n{0}".format(e))
+    sys.exit(1)
+
+# ---------------------------------------------------------------------